@@ -0,0 +1,31 @@
+"""
+Micro-benchmarks for coolfig, runnable offline with the standard library
+only:
+
+    python -m benchmarks                    # run everything
+    python -m benchmarks -k providers       # only matching benchmarks
+    python -m benchmarks --json base.json   # save the results
+    python -m benchmarks --compare base.json  # report regressions
+
+Benchmarks are functions registered with the `benchmark` decorator. They
+receive the size parameter, do their setup and return a callable; the
+runner times the callable and optionally measures its peak allocations.
+"""
+BENCHMARKS = []
+
+
+def benchmark(*sizes):
+    """
+    Register the decorated function as a benchmark, to be run once for each
+    of the given `sizes`.
+    """
+
+    def decorator(func):
+        module = func.__module__.rsplit(".", 1)[-1]
+        if module.startswith("bench_"):
+            module = module[len("bench_") :]
+        name = "{}.{}".format(module, func.__name__)
+        BENCHMARKS.append((name, func, sizes or (None,)))
+        return func
+
+    return decorator
@@ -0,0 +1,112 @@
+import argparse
+import fnmatch
+import importlib
+import json
+import os
+import pkgutil
+import sys
+import timeit
+import tracemalloc
+
+from benchmarks import BENCHMARKS
+
+
+def discover():
+    path = os.path.dirname(os.path.abspath(__file__))
+    for module in pkgutil.iter_modules([path]):
+        if module.name.startswith("bench_"):
+            importlib.import_module("benchmarks." + module.name)
+
+
+def measure_time(func, repeat):
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def measure_memory(func):
+    func()  # Warm up lazy imports and caches
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def format_time(seconds):
+    for unit, factor in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * factor >= 1:
+            return "{:.2f} {}".format(seconds * factor, unit)
+    return "{:.0f} ns".format(seconds * 1e9)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "-k", dest="pattern", default="*", help="glob to select benchmarks"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="also measure the peak memory allocated by a single call",
+    )
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument(
+        "--compare", help="compare the results with a previous --json run"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as a regression (default: 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    discover()
+    if "*" not in args.pattern and "?" not in args.pattern:
+        args.pattern = "*{}*".format(args.pattern)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+
+    results = {}
+    regressions = []
+    for name, func, sizes in BENCHMARKS:
+        for size in sizes:
+            label = name if size is None else "{}[{}]".format(name, size)
+            if not fnmatch.fnmatch(label, args.pattern):
+                continue
+            bench = func() if size is None else func(size)
+            result = {"time": measure_time(bench, args.repeat)}
+            line = "{:<50} {:>12}".format(label, format_time(result["time"]))
+            if args.memory:
+                result["memory"] = measure_memory(bench)
+                line += " {:>12,} B".format(result["memory"])
+                if size:
+                    line += " {:>8,.0f} B/item".format(result["memory"] / size)
+            if label in baseline:
+                ratio = result["time"] / baseline[label]["time"] - 1
+                line += " {:+.1%}".format(ratio)
+                if ratio > args.threshold:
+                    regressions.append(label)
+                    line += " REGRESSION"
+            print(line)
+            results[label] = result
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+    if regressions:
+        print("\n{} regression(s) found".format(len(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+import sys
+import types
+
+from benchmarks import benchmark
+
+from coolfig import Settings, Value
+from coolfig.django import load_django_settings
+from coolfig.providers import DictConfig
+
+
+def install_apps(size):
+    """
+    Register `size` synthetic apps, one in four of them with app settings.
+    """
+    apps = []
+    for i in range(size):
+        name = "coolfig_bench_app{}_{}".format(size, i)
+        if i % 4 == 0:
+            attrs = {"APP{}_KEY".format(i): Value(str, default="value")}
+            settings = types.ModuleType(name + ".settings")
+            settings.AppSettings = type("AppSettings", (Settings,), attrs)
+            sys.modules[name] = types.ModuleType(name)
+            sys.modules[settings.__name__] = settings
+        apps.append(name)
+    return apps
+
+
+@benchmark(10, 80)
+def load_settings(size):
+    static_config = {
+        "INSTALLED_APPS": install_apps(size),
+        "ROOT_URLCONF": "bench.urls",
+    }
+    provider = DictConfig({"SECRET_KEY": "secret"})
+
+    def run():
+        load_django_settings(
+            provider, static_config, name="coolfig_bench_settings"
+        )
+
+    return run
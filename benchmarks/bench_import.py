@@ -0,0 +1,49 @@
+import importlib
+import sys
+
+from benchmarks import benchmark
+
+
+def reimport(*names):
+    """
+    Return a callable importing `names` from scratch, as far as coolfig is
+    concerned: the already imported coolfig modules are removed from
+    `sys.modules` for the duration of each call and restored afterwards.
+    """
+
+    def run():
+        saved = {
+            k: v
+            for k, v in sys.modules.items()
+            if k == "coolfig" or k.startswith("coolfig.")
+        }
+        for k in saved:
+            del sys.modules[k]
+        try:
+            for name in names:
+                module, _, attr = name.partition(":")
+                module = importlib.import_module(module)
+                if attr:
+                    getattr(module, attr)
+        finally:
+            for k in list(sys.modules):
+                if k == "coolfig" or k.startswith("coolfig."):
+                    del sys.modules[k]
+            sys.modules.update(saved)
+
+    return run
+
+
+@benchmark()
+def coolfig():
+    return reimport("coolfig")
+
+
+@benchmark()
+def coolfig_settings():
+    return reimport("coolfig:Settings")
+
+
+@benchmark()
+def coolfig_django():
+    return reimport("coolfig:load_django_settings")
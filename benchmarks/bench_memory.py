@@ -0,0 +1,61 @@
+"""
+Schemas and providers built in bulk, to be run with ``--memory``: the
+runner then also reports the footprint of each setting (or provider).
+"""
+from benchmarks import benchmark
+
+from coolfig import Settings, Value
+from coolfig.django import make_django_settings
+from coolfig.providers import DictConfig, FallbackProvider
+from coolfig.schema import computed_value, ref
+
+
+SIZES = (1000, 10000)
+
+
+@benchmark(*SIZES)
+def schema_values(size):
+    names = ["KEY_{}".format(i) for i in range(size)]
+
+    def run():
+        attrs = {name: Value(str, default=ref("KEY_0")) for name in names}
+        return type("MemorySettings", (Settings,), attrs)
+
+    return run
+
+
+@benchmark(*SIZES)
+def static_values(size):
+    static_config = {"KEY_{}".format(i): i for i in range(size)}
+    return lambda: make_django_settings(static_config)
+
+
+@benchmark(*SIZES)
+def providers(size):
+    conf = {}
+    return lambda: [
+        FallbackProvider([DictConfig(conf, indexed=True), DictConfig(conf)])
+        for _ in range(size)
+    ]
+
+
+@benchmark(100, 1000)
+def overlays(size):
+    attrs = {"KEY_{}".format(i): Value(str) for i in range(1000)}
+    attrs["COMPUTED"] = computed_value(lambda self: self.KEY_0.upper())
+    schema = type("MemorySettings", (Settings,), attrs)
+    conf = {"KEY_{}".format(i): str(i) for i in range(1000)}
+    base = schema(DictConfig(conf), cache=True)
+    base.as_dict()
+    tenants = [
+        DictConfig({"KEY_0": "tenant{}".format(i), "KEY_1": "value"})
+        for i in range(size)
+    ]
+
+    def run():
+        overlays = [base.overlay(tenant) for tenant in tenants]
+        for overlay in overlays:
+            overlay.as_dict()
+        return overlays
+
+    return run
@@ -0,0 +1,208 @@
+import atexit
+import json
+import os
+import shutil
+import tempfile
+
+from benchmarks import benchmark
+
+from coolfig.providers import (
+    NOT_PROVIDED,
+    DictConfig,
+    EnvDirConfig,
+    EnvFileConfig,
+    FallbackProvider,
+    JSONConfig,
+    SharedMemoryConfig,
+    SharedMemoryPublisher,
+)
+
+
+SIZES = (10, 100, 1000, 10000)
+FILE_SIZES = (10, 100, 1000)
+
+
+def make_config(size):
+    """
+    Return `size` keys, a tenth of which share the ``PREFIX_`` prefix.
+    """
+    config = {}
+    for i in range(size):
+        prefix = "PREFIX_" if i % 10 == 0 else "KEY_"
+        config["{}{}".format(prefix, i)] = str(i)
+    return config
+
+
+_directories = {}
+
+
+def make_directory(size):
+    if size not in _directories:
+        path = tempfile.mkdtemp(prefix="coolfig-bench-")
+        atexit.register(shutil.rmtree, path, True)
+        for k, v in make_config(size).items():
+            with open(os.path.join(path, k), "w") as fh:
+                fh.write(v)
+        _directories[size] = path
+    return _directories[size]
+
+
+@benchmark(*SIZES)
+def dict_get(size):
+    conf = DictConfig(make_config(size))
+    return lambda: conf.get("KEY_1")
+
+
+@benchmark(*SIZES)
+def dict_iterprefixed(size):
+    conf = DictConfig(make_config(size))
+    return lambda: list(conf.iterprefixed("PREFIX_"))
+
+
+@benchmark(*SIZES)
+def dict_iterprefixed_indexed(size):
+    conf = DictConfig(make_config(size), indexed=True)
+    return lambda: list(conf.iterprefixed("PREFIX_"))
+
+
+@benchmark(*FILE_SIZES)
+def envdir_get(size):
+    conf = EnvDirConfig(make_directory(size))
+    return lambda: conf.get("KEY_1")
+
+
+@benchmark(*FILE_SIZES)
+def envdir_get_snapshot(size):
+    conf = EnvDirConfig(make_directory(size), snapshot=True)
+    return lambda: conf.get("KEY_1")
+
+
+@benchmark(*FILE_SIZES)
+def envdir_iterprefixed(size):
+    conf = EnvDirConfig(make_directory(size))
+    return lambda: list(conf.iterprefixed("PREFIX_"))
+
+
+@benchmark(*FILE_SIZES)
+def envdir_iterprefixed_snapshot(size):
+    conf = EnvDirConfig(make_directory(size), snapshot=True)
+    return lambda: list(conf.iterprefixed("PREFIX_"))
+
+
+_envfiles = {}
+
+
+def make_envfile(size):
+    if size not in _envfiles:
+        fd, path = tempfile.mkstemp(prefix="coolfig-bench-", suffix=".env")
+        atexit.register(os.unlink, path)
+        with os.fdopen(fd, "w") as fh:
+            for k, v in make_config(size).items():
+                fh.write("{}={}\n".format(k, v))
+        _envfiles[size] = path
+    return _envfiles[size]
+
+
+@benchmark(*SIZES)
+def envfile_load(size):
+    path = make_envfile(size)
+    return lambda: EnvFileConfig(path)
+
+
+@benchmark(*SIZES)
+def envfile_get(size):
+    conf = EnvFileConfig(make_envfile(size))
+    return lambda: conf.get("KEY_1")
+
+
+@benchmark(*SIZES)
+def envfile_iterprefixed(size):
+    conf = EnvFileConfig(make_envfile(size))
+    return lambda: list(conf.iterprefixed("PREFIX_"))
+
+
+_jsonfiles = {}
+
+
+def make_jsonfile(size):
+    if size not in _jsonfiles:
+        fd, path = tempfile.mkstemp(prefix="coolfig-bench-", suffix=".json")
+        atexit.register(os.unlink, path)
+        with os.fdopen(fd, "w") as fh:
+            json.dump(make_config(size), fh)
+        _jsonfiles[size] = path
+    return _jsonfiles[size]
+
+
+@benchmark(*SIZES)
+def json_load(size):
+    path = make_jsonfile(size)
+    return lambda: JSONConfig(path)
+
+
+@benchmark(*SIZES)
+def json_iterprefixed(size):
+    conf = JSONConfig(make_jsonfile(size))
+    return lambda: list(conf.iterprefixed("PREFIX_"))
+
+
+_snapshots = {}
+
+
+def make_snapshot(size):
+    if size not in _snapshots:
+        fd, path = tempfile.mkstemp(prefix="coolfig-bench-", suffix=".shm")
+        os.close(fd)
+        atexit.register(os.unlink, path)
+        SharedMemoryPublisher(path).publish(make_config(size))
+        _snapshots[size] = path
+    return _snapshots[size]
+
+
+@benchmark(*SIZES)
+def shm_get(size):
+    conf = SharedMemoryConfig(make_snapshot(size))
+    return lambda: conf.get("KEY_1")
+
+
+@benchmark(*SIZES)
+def shm_iterprefixed(size):
+    conf = SharedMemoryConfig(make_snapshot(size))
+    return lambda: list(conf.iterprefixed("PREFIX_"))
+
+
+def make_fallback(size, cache):
+    return FallbackProvider(
+        [
+            DictConfig({}),
+            EnvDirConfig(make_directory(size)),
+            DictConfig(make_config(size)),
+        ],
+        cache=cache,
+    )
+
+
+@benchmark(*FILE_SIZES)
+def fallback_get_miss(size):
+    conf = make_fallback(size, cache=False)
+    assert conf.get("MISSING") is NOT_PROVIDED
+    return lambda: conf.get("MISSING")
+
+
+@benchmark(*FILE_SIZES)
+def fallback_get_miss_cached(size):
+    conf = make_fallback(size, cache=True)
+    return lambda: conf.get("MISSING")
+
+
+@benchmark(*FILE_SIZES)
+def fallback_iterprefixed(size):
+    conf = make_fallback(size, cache=False)
+    return lambda: list(conf.iterprefixed("PREFIX_"))
+
+
+@benchmark(*FILE_SIZES)
+def fallback_get_many(size):
+    conf = make_fallback(size, cache=False)
+    keys = list(make_config(size)) + ["MISSING"]
+    return lambda: conf.get_many(keys)
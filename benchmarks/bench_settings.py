@@ -0,0 +1,72 @@
+from benchmarks import benchmark
+
+from coolfig import Settings, Value, types
+from coolfig.providers import DictConfig
+from coolfig.schema import DictValue
+
+
+def make_schema(size, name="BenchSettings", prefix="KEY_"):
+    attrs = {"{}{}".format(prefix, i): Value(int) for i in range(size)}
+    return type(name, (Settings,), attrs)
+
+
+def make_config(size, prefix="KEY_"):
+    return {"{}{}".format(prefix, i): str(i) for i in range(size)}
+
+
+class AccessSettings(Settings):
+    DEBUG = Value(types.boolean, default=False)
+    ALLOWED_HOSTS = Value(types.list(str), default=())
+    DATABASES = DictValue(str, str.lower)
+
+
+ACCESS_CONFIG = dict(
+    make_config(100, prefix="OTHER_"),
+    DEBUG="true",
+    ALLOWED_HOSTS="example.com, www.example.com, api.example.com",
+    DATABASES_DEFAULT="postgres://localhost/db",
+    DATABASES_REPLICA="postgres://replica/db",
+)
+
+
+@benchmark()
+def access_boolean():
+    s = AccessSettings(DictConfig(ACCESS_CONFIG))
+    return lambda: s.DEBUG
+
+
+@benchmark()
+def access_boolean_cached():
+    s = AccessSettings(DictConfig(ACCESS_CONFIG), cache=True)
+    return lambda: s.DEBUG
+
+
+@benchmark()
+def access_list():
+    s = AccessSettings(DictConfig(ACCESS_CONFIG))
+    return lambda: s.ALLOWED_HOSTS
+
+
+@benchmark()
+def access_dict_value():
+    s = AccessSettings(DictConfig(ACCESS_CONFIG))
+    return lambda: s.DATABASES
+
+
+@benchmark(10, 100, 1000, 10000)
+def as_dict(size):
+    s = make_schema(size)(DictConfig(make_config(size)))
+    return s.as_dict
+
+
+@benchmark(10, 100, 1000)
+def merge(size):
+    apps = [
+        make_schema(5, "App{}Settings".format(i), "APP{}_".format(i))
+        for i in range(size)
+    ]
+
+    def run():
+        type("MergedSettings", (Settings,), {}).merge(*apps)
+
+    return run
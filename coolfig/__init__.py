@@ -9,12 +9,10 @@ Support for working with different sources of configuration values.
 
     settings = DefaultSettings(
         providers.DictConfig(os.environ, prefix='MYAPP_'))
-"""
-from .django import load_django_settings
-from .providers import DictConfig, EnvConfig, EnvDirConfig
-from .schema import Dictionary, Settings, Value, computed_value
-
 
+The names exported by this package are imported lazily from their
+submodules on first access, so that importing it stays cheap.
+"""
 __version__ = "3.1.0"
 __url__ = "https://github.com/GaretJax/coolfig"
 __all__ = [
@@ -27,3 +25,31 @@ __all__ = [
     "Settings",
     "Value",
 ]
+
+_exports = {
+    "computed_value": "schema",
+    "DictConfig": "providers",
+    "Dictionary": "schema",
+    "EnvConfig": "providers",
+    "EnvDirConfig": "providers",
+    "load_django_settings": "django",
+    "Settings": "schema",
+    "Value": "schema",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _exports[name]
+    except KeyError:
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(__name__, name)
+        )
+    # Relative import of the submodule, without loading importlib
+    value = getattr(__import__(module, globals(), None, [name], 1), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
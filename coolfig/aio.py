@@ -0,0 +1,119 @@
+"""
+Support for resolving settings from asyncio applications.
+
+    settings = DefaultSettings(aio.AsyncEnvDirConfig('/run/secrets'))
+    values = await settings.aresolve()
+"""
+import asyncio
+import copy
+
+from .providers import NOT_PROVIDED, DictConfig, EnvDirConfig
+from .schema import OverlayCache
+
+
+class AsyncConfigurationProvider(object):
+    """
+    Asynchronous counterpart of `providers.ConfigurationProvider`.
+
+    `get` and `get_many` are coroutines, `iterprefixed` returns an
+    asynchronous iterator.
+    """
+
+    __slots__ = ()
+
+    async def get(self, key):
+        raise NotImplementedError()
+
+    async def get_many(self, keys):
+        keys = list(keys)
+        values = await asyncio.gather(*(self.get(key) for key in keys))
+        return dict(zip(keys, values))
+
+    def iterprefixed(self, prefix):
+        raise NotImplementedError()
+
+
+class AsyncProviderAdapter(AsyncConfigurationProvider):
+    """
+    Exposes a synchronous provider through the asynchronous interface by
+    running its lookups in `executor` (the default executor of the loop if
+    not given).
+    """
+
+    __slots__ = ("_provider", "_executor")
+
+    def __init__(self, provider, executor=None):
+        self._provider = provider
+        self._executor = executor
+
+    def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, func, *args)
+
+    async def get(self, key):
+        return await self._run(self._provider.get, key)
+
+    async def get_many(self, keys):
+        return await self._run(self._provider.get_many, list(keys))
+
+    async def iterprefixed(self, prefix):
+        def collect():
+            return list(self._provider.iterprefixed(prefix))
+
+        for item in await self._run(collect):
+            yield item
+
+
+class AsyncEnvDirConfig(AsyncProviderAdapter):
+    """
+    Asynchronous `providers.EnvDirConfig`, reading the files in a thread
+    pool. The remaining arguments are passed to `EnvDirConfig`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, base_path, prefix="", executor=None, **kwargs):
+        super(AsyncEnvDirConfig, self).__init__(
+            EnvDirConfig(base_path, prefix, **kwargs), executor
+        )
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+async def resolve(settings):
+    """
+    Resolve all values of `settings` and return them as a dictionary.
+
+    The raw values are fetched concurrently from the provider of `settings`,
+    which is wrapped in an `AsyncProviderAdapter` if it is not asynchronous,
+    and are then coerced in memory. Computed values only have access to the
+    keys required by the schema. If caching is enabled on `settings`, the
+    resolved values are stored in its cache (for overlays, only the values
+    not shared with the base instance).
+    """
+    provider = settings.config_provider
+    if not isinstance(provider, AsyncConfigurationProvider):
+        provider = AsyncProviderAdapter(provider)
+
+    keys, prefixes = settings.provider_lookups()
+    results = await asyncio.gather(
+        provider.get_many(keys),
+        *(_collect(provider.iterprefixed(prefix)) for prefix in prefixes)
+    )
+    provided = {k: v for k, v in results[0].items() if v is not NOT_PROVIDED}
+    for items in results[1:]:
+        provided.update(items)
+
+    snapshot = copy.copy(settings)
+    snapshot.config_provider = DictConfig(provided)
+    snapshot._cache = None
+    values = snapshot.as_dict()
+    cache = settings._cache
+    if isinstance(cache, OverlayCache):
+        # The other values are already read from the cache of the base
+        cache.update((k, values[k]) for k in cache.local)
+    elif cache is not None:
+        cache.update(values)
+    return values
@@ -0,0 +1,185 @@
+"""
+Generation of plain Python modules from resolved settings.
+
+Resolving the settings once (e.g. when building a container image or in
+its entrypoint) and pointing ``DJANGO_SETTINGS_MODULE`` to the generated
+module avoids loading the apps settings, importing dotted paths and parsing
+URLs in every worker:
+
+    python -m coolfig.codegen --django myproject.static_settings \\
+        --envdir /run/secrets myproject/generated_settings.py
+
+The generated module records a fingerprint of the provider contents, use
+``--check`` to find out whether it has to be regenerated.
+"""
+import argparse
+import ast
+import hashlib
+import importlib
+import os
+import pickle
+import re
+import sys
+import tempfile
+
+from .providers import DictConfig, EnvDirConfig, FallbackProvider
+from .schema import ImproperlyConfigured, StaticValue
+
+
+FINGERPRINT_NAME = "__coolfig_fingerprint__"
+FINGERPRINT_RE = re.compile(
+    r"^{} = ['\"]([0-9a-f]+)['\"]$".format(FINGERPRINT_NAME), re.MULTILINE
+)
+
+
+def fingerprint(settings):
+    """
+    Return a hash of the names of the settings of `settings`, of the raw
+    values its provider holds for them and of its static values (e.g. the
+    static configuration of Django settings).
+    """
+    digest = hashlib.sha256()
+    for k, v in settings:
+        digest.update(repr(k).encode("utf-8"))
+        if isinstance(v, StaticValue):
+            digest.update(repr(v.value).encode("utf-8"))
+    for item in sorted(settings.provided_values().items()):
+        digest.update(repr(item).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_literal(value):
+    try:
+        return ast.literal_eval(repr(value)) == value
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return False
+
+
+def render_module(settings):
+    """
+    Resolve all values of `settings` and return the source code of a module
+    defining them as constants.
+
+    Values which cannot be written as Python literals are embedded as
+    pickles.
+    """
+    lines = [
+        '"""',
+        "Generated by coolfig.codegen from {}, do not edit.".format(
+            settings.__class__.__name__
+        ),
+        '"""',
+        "from pickle import loads as _loads",
+        "",
+        "",
+        "{} = {!r}".format(FINGERPRINT_NAME, fingerprint(settings)),
+        "",
+    ]
+    for k, v in sorted(settings.as_dict().items()):
+        if is_literal(v):
+            lines.append("{} = {!r}".format(k, v))
+            continue
+        try:
+            data = pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            raise ImproperlyConfigured(
+                "cannot serialize the value of {}: {}".format(k, e)
+            )
+        lines.append("{} = _loads({!r})".format(k, data))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def write_module(settings, path):
+    """
+    Write the module rendered from `settings` to `path` atomically.
+    """
+    source = render_module(settings)
+    dirname = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix=".py.tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(source)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_fingerprint(path):
+    """
+    Return the fingerprint recorded in the generated module at `path`, or
+    None if the file does not exist or does not contain one.
+    """
+    try:
+        with open(path) as fh:
+            match = FINGERPRINT_RE.search(fh.read())
+    except (IOError, OSError):
+        return None
+    return match.group(1) if match else None
+
+
+def is_stale(settings, path):
+    """
+    Return whether the module at `path` is missing or was generated from
+    different provider contents than the ones of `settings`.
+    """
+    return read_fingerprint(path) != fingerprint(settings)
+
+
+def get_provider(prefix="", envdirs=()):
+    providers = [DictConfig(os.environ, prefix=prefix)]
+    providers.extend(EnvDirConfig(path, prefix=prefix) for path in envdirs)
+    return FallbackProvider(providers) if len(providers) > 1 else providers[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m coolfig.codegen",
+        description="Resolve settings and write them as a Python module.",
+    )
+    schema = parser.add_mutually_exclusive_group(required=True)
+    schema.add_argument(
+        "--settings", help="dotted path to a Settings subclass"
+    )
+    schema.add_argument(
+        "--django",
+        metavar="MODULE",
+        help="module holding the static Django configuration",
+    )
+    parser.add_argument("--prefix", default="", help="environment prefix")
+    parser.add_argument(
+        "--envdir",
+        action="append",
+        default=[],
+        help="fallback directory of secret files (can be repeated)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="exit with status 1 if the output is stale instead of writing it",
+    )
+    parser.add_argument("output", help="path of the module to generate")
+    args = parser.parse_args(argv)
+
+    provider = get_provider(args.prefix, args.envdir)
+    if args.django:
+        from .django import load_django_settings
+
+        static_config = vars(importlib.import_module(args.django))
+        settings = load_django_settings(
+            provider, static_config, name="__coolfig_codegen__"
+        )
+    else:
+        module_path, name = args.settings.rsplit(".", 1)
+        settings_class = getattr(importlib.import_module(module_path), name)
+        settings = settings_class(provider, cache=True)
+
+    if args.check:
+        return 1 if is_stale(settings, args.output) else 0
+    write_module(settings, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,7 @@
-from __future__ import absolute_import
-
+import importlib.util
 import os
 import sys
 
-import six
-
 from . import types
 from .providers import FallbackProvider
 from .schema import DictValue, Settings, StaticValue, Value
@@ -31,36 +28,182 @@ class BaseDjangoSettings(Settings):
     STATIC_URL = Value(str, default="/static/")
 
     def install(self, name=None):
-        if not name:
-            name = os.environ["DJANGO_SETTINGS_MODULE"]
-        try:
-            self.__file__ = sys.modules[name].__file__
-        except (KeyError, AttributeError):
-            pass
-        sys.modules[name] = self
+        install_settings(self, name)
 
-    def load_apps(self, apps=None):
+    def load_apps(self, apps=None, cache_path=None):
+        """
+        Merge the settings of the installed apps into this schema.
+
+        If `cache_path` is given, the apps without settings are remembered
+        in that file across runs (see `AppSettingsFinder`).
+        """
         if apps is None:
             apps = getattr(self, "INSTALLED_APPS", [])
 
+        finder = AppSettingsFinder(cache_path)
         for app_path in apps:
-            settings_path = get_app_settings_path(app_path)
+            app_settings = finder.find(get_app_settings_path(app_path))
+            if app_settings is not None:
+                self.merge(app_settings)
+        finder.save()
+
+
+class AppSettingsFinder(object):
+    """
+    Locates the settings classes of installed apps.
+
+    Settings modules are looked up with `importlib.util.find_spec` before
+    being imported, so that apps without settings do not go through a
+    failing import. If `cache_path` is given, the apps found not to have
+    settings are persisted to that file along with the modification time of
+    their package directory and settings module, and are skipped on later
+    runs until one of those changes. The whole cache is discarded when the
+    Python version, `sys.path` or the contents of its directories (i.e. the
+    installed packages) change.
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path
+        self._key = None
+        self._missing = None
+        self._dirty = False
+
+    @staticmethod
+    def get_cache_key():
+        import hashlib
+
+        digest = hashlib.sha256(sys.version.encode("utf-8"))
+        for entry in sys.path:
+            try:
+                mtime = os.stat(entry or os.curdir).st_mtime_ns
+            except OSError:
+                mtime = None
+            digest.update("\0{}\0{}".format(entry, mtime).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _get_missing(self):
+        import json
+
+        if self._missing is None:
+            self._missing = {}
+            if self.cache_path:
+                self._key = self.get_cache_key()
+                try:
+                    with open(self.cache_path) as fh:
+                        data = json.load(fh)
+                except (IOError, OSError, ValueError):
+                    data = {}
+                if data.get("key") == self._key:
+                    self._missing = data.get("missing", {})
+        return self._missing
+
+    @staticmethod
+    def _get_stamp(paths):
+        stamp = []
+        for path in paths:
+            try:
+                stamp.append([path, os.stat(path).st_mtime_ns])
+            except OSError:
+                pass
+        return stamp
+
+    def find(self, settings_path):
+        """
+        Return the object at the dotted `settings_path`, or None if it does
+        not exist.
+        """
+        missing = self._get_missing()
+        if settings_path in missing:
+            stamp = missing[settings_path]
+            if self._get_stamp(path for path, _ in stamp) == stamp:
+                return None
+
+        module_path, _ = settings_path.rsplit(".", 1)
+        parent_path = module_path.rpartition(".")[0]
+        if module_path in sys.modules:
+            exists = True
+            origin = getattr(sys.modules[module_path], "__file__", None)
+        else:
+            try:
+                spec = importlib.util.find_spec(module_path)
+            except (ImportError, ValueError):
+                spec = None
+            exists = spec is not None
+            origin = spec.origin if exists else None
 
+        if exists:
             try:
-                app_settings = types.dottedpath(settings_path)
+                return types.dottedpath(settings_path)
             except (ImportError, AttributeError):
                 pass
-            else:
-                self.merge(app_settings)
-
 
-def get_app_settings_path(app_path):
+        parent = sys.modules.get(parent_path)
+        paths = list(getattr(parent, "__path__", None) or [])
+        if origin and os.path.isfile(origin):
+            paths.append(origin)
+        missing[settings_path] = self._get_stamp(paths)
+        self._dirty = True
+        return None
+
+    def save(self):
+        """
+        Persist the apps without settings to the cache file, if any.
+        """
+        import json
+        import tempfile
+
+        if not self.cache_path or not self._dirty:
+            return
+        data = {"key": self._key, "missing": self._missing}
+        dirname = os.path.dirname(os.path.abspath(self.cache_path))
+        fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fh:
+                json.dump(data, fh)
+            os.replace(tmp_path, self.cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._dirty = False
+
+
+def install_settings(settings, name=None):
+    """
+    Register `settings` as the module `name` (defaults to the value of the
+    ``DJANGO_SETTINGS_MODULE`` environment variable).
+    """
+    if not name:
+        name = os.environ["DJANGO_SETTINGS_MODULE"]
     try:
-        from django.apps import AppConfig
-    except ImportError:
-        # AppConfigs not supported on this django version
+        settings.__file__ = sys.modules[name].__file__
+    except (KeyError, AttributeError):
         pass
-    else:
+    sys.modules[name] = settings
+
+
+_app_config_class = None
+
+
+def get_app_config_class():
+    """
+    Return Django's `AppConfig` class, or False if it is not available.
+
+    The result is remembered, failed imports are not cached by Python.
+    """
+    global _app_config_class
+    if _app_config_class is None:
+        try:
+            from django.apps import AppConfig
+        except ImportError:
+            # AppConfigs not supported on this django version
+            AppConfig = False
+        _app_config_class = AppConfig
+    return _app_config_class
+
+
+def get_app_settings_path(app_path):
+    AppConfig = get_app_config_class()
+    if AppConfig:
         if "." in app_path:
             # Check if this is a path to a Django AppConfig class
             try:
@@ -82,18 +225,29 @@ def get_app_settings_path(app_path):
 def make_django_settings(static_config, base=BaseDjangoSettings):
     static_config = {
         k: StaticValue(v)
-        for k, v in six.iteritems(static_config)
+        for k, v in static_config.items()
         if k.upper() == k
     }
     return type("DjangoSettings", (base,), static_config)
 
 
 def load_django_settings(
-    provider, static_config, base=BaseDjangoSettings, apps=None, name=None
+    provider,
+    static_config,
+    base=BaseDjangoSettings,
+    apps=None,
+    name=None,
+    cache=False,
+    freeze=False,
+    app_cache=None,
 ):
     if isinstance(provider, (list, tuple)):
         provider = FallbackProvider(provider)
     settings_class = make_django_settings(static_config, base)
-    settings = settings_class(provider)
+    settings = settings_class(provider, cache=cache)
     settings.install(name)
-    settings.load_apps(apps)
+    settings.load_apps(apps, cache_path=app_cache)
+    if freeze:
+        settings = settings.freeze()
+        install_settings(settings, name)
+    return settings
@@ -1,27 +1,79 @@
 import errno
+import mmap
 import os
+import struct
+import time
+from _thread import allocate_lock
+from bisect import bisect_left
 from functools import partial
+from itertools import islice
 
 
 NOT_PROVIDED = object()
 
 
 class ConfigurationProvider(object):
+    __slots__ = ()
+
     def get(self, key):
         raise NotImplementedError()
 
+    def get_many(self, keys):
+        """
+        Look up all of `keys` at once and return a dictionary mapping each of
+        them to its value (or to `NOT_PROVIDED`).
+
+        Providers able to fetch multiple keys in a single operation should
+        override this method.
+        """
+        return {key: self.get(key) for key in keys}
+
     def iterprefixed(self, prefix):
         raise NotImplementedError()
 
 
+def iter_sorted_prefixed(sorted_keys, prefix):
+    """
+    Yield the keys of the sorted sequence `sorted_keys` starting with
+    `prefix`, in O(log n + k).
+    """
+    for k in islice(sorted_keys, bisect_left(sorted_keys, prefix), None):
+        if not k.startswith(prefix):
+            break
+        yield k
+
+
 class DictConfig(ConfigurationProvider):
     """
     Loads configuration values from the passed dictionary.
+
+    If `indexed` is true, a sorted index of the keys is built on the first
+    prefix lookup and used to answer `iterprefixed` without scanning the
+    whole dictionary. The index is rebuilt when the number of keys changes;
+    call `invalidate` if keys may have been replaced in the meantime.
     """
 
-    def __init__(self, conf_dict, prefix=""):
+    __slots__ = ("_conf_dict", "_prefix", "_indexed", "_index")
+
+    def __init__(self, conf_dict, prefix="", indexed=False):
         self._conf_dict = conf_dict
         self._prefix = prefix
+        self._indexed = indexed
+        self._index = None
+
+    def invalidate(self, key=None):
+        """
+        Drop the prefix index; it will be rebuilt on the next lookup.
+
+        The whole index is dropped even if a `key` is given.
+        """
+        self._index = None
+
+    def _get_index(self):
+        index = self._index
+        if index is None or len(index) != len(self._conf_dict):
+            index = self._index = sorted(self._conf_dict)
+        return index
 
     def get(self, key):
         try:
@@ -29,19 +81,269 @@ class DictConfig(ConfigurationProvider):
         except KeyError:
             return NOT_PROVIDED
 
+    def get_many(self, keys):
+        conf_dict, prefix = self._conf_dict, self._prefix
+        return {key: conf_dict.get(prefix + key, NOT_PROVIDED) for key in keys}
+
     def iterprefixed(self, prefix):
         prefix = self._prefix + prefix
-        for k in self._conf_dict:
-            if k.startswith(prefix):
-                yield (k[len(self._prefix) :], self._conf_dict[k])
+        if self._indexed:
+            for k in iter_sorted_prefixed(self._get_index(), prefix):
+                try:
+                    yield (k[len(self._prefix) :], self._conf_dict[k])
+                except KeyError:
+                    pass  # Removed since the index was built
+        else:
+            for k in self._conf_dict:
+                if k.startswith(prefix):
+                    yield (k[len(self._prefix) :], self._conf_dict[k])
+
+
+def flatten(data, prefix="", sep="_"):
+    """
+    Flatten the nested dictionary `data` into a dictionary of string values
+    whose keys are the uppercased path of each of them, joined by `sep`
+    (``{"db": {"host": "x"}}`` becomes ``{"DB_HOST": "x"}``).
+
+    Booleans become ``"true"`` or ``"false"``, lists are joined by commas
+    (as expected by `types.list`) and null values are omitted.
+    """
+    values = {}
+    for k, v in data.items():
+        key = prefix + str(k).upper()
+        if isinstance(v, dict):
+            values.update(flatten(v, key + sep, sep))
+        elif v is not None:
+            values[key] = _flatten_leaf(v)
+    return values
+
+
+def _flatten_leaf(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    elif isinstance(value, (list, tuple)):
+        return ",".join(_flatten_leaf(v) for v in value)
+    return str(value)
+
+
+# Parsed files, by provider class, path and separator, along with the
+# modification time and size of the file they were parsed from
+_parsed_files = {}
+
+
+class FileConfig(DictConfig):
+    """
+    Base class for the providers loading values from a structured file.
+
+    Nested sections are flattened into keys like ``SECTION_KEY`` (see
+    `flatten`), which can be read with `Value` and, for whole sections,
+    `DictValue`. Parsed files are cached for the whole process together with
+    their sorted key index, and only parsed again when the modification time
+    or the size of the file changes; call `reload` to pick up changes. A
+    missing file is treated as an empty one.
+
+    Subclasses implement `parse`, receiving the file opened in `mode`.
+    """
+
+    __slots__ = ("_path", "_sep")
+
+    mode = "rb"
+
+    def __init__(self, path, prefix="", sep="_"):
+        self._path = path
+        self._sep = sep
+        super(FileConfig, self).__init__({}, prefix, indexed=True)
+        self.reload()
+
+    def parse(self, fh):
+        """
+        Return the content of the file `fh` as a nested dictionary.
+        """
+        raise NotImplementedError()
+
+    def _load(self):
+        try:
+            stat = os.stat(self._path)
+        except OSError as e:
+            if e.errno == errno.EACCES:  # Wrong permissions
+                raise
+            return {}, []  # File does not exist
+        key = (self.__class__, os.path.realpath(self._path), self._sep)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = _parsed_files.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        with open(self._path, self.mode) as fh:
+            values = flatten(self.parse(fh), sep=self._sep)
+        parsed = (values, sorted(values))
+        _parsed_files[key] = (stamp, parsed)
+        return parsed
+
+    def reload(self):
+        """
+        Load the file again if it changed.
+        """
+        self._conf_dict, self._index = self._load()
+
+
+class JSONConfig(FileConfig):
+    """
+    Loads configuration values from a JSON file.
+    """
+
+    __slots__ = ()
+
+    def parse(self, fh):
+        import json
+
+        return json.load(fh)
+
+
+class TOMLConfig(FileConfig):
+    """
+    Loads configuration values from a TOML file (requires Python 3.11 or the
+    ``tomli`` package).
+    """
+
+    __slots__ = ()
+
+    def parse(self, fh):
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+
+        return tomllib.load(fh)
+
+
+class INIConfig(FileConfig):
+    """
+    Loads configuration values from an INI file, as read by `configparser`
+    (without interpolation). The options of the ``DEFAULT`` section are
+    provided without a prefix, as well as in every other section.
+    """
+
+    __slots__ = ()
+
+    mode = "r"
+
+    def parse(self, fh):
+        from configparser import ConfigParser
+
+        parser = ConfigParser(interpolation=None)
+        parser.read_file(fh)
+        data = dict(parser.defaults())
+        for section in parser.sections():
+            data[section] = dict(parser.items(section))
+        return data
 
 
 class EnvDirConfig(ConfigurationProvider):
-    def __init__(self, base_path, prefix=""):
+    """
+    Loads configuration values from the files contained in a directory, using
+    the file names as keys (as with Docker or Kubernetes secrets).
+
+    By default each lookup reads the corresponding file. If `snapshot` is
+    true, the whole directory is read once and lookups are served from
+    memory until `reload` is called. With `check_stale`, the snapshot is also
+    reloaded whenever the inode or the modification time of the directory
+    changes, which happens when files are added, removed or atomically
+    replaced.
+    """
+
+    __slots__ = (
+        "_base_path",
+        "_prefix",
+        "_check_stale",
+        "_snapshot",
+        "_stamp",
+    )
+
+    def __init__(
+        self, base_path, prefix="", snapshot=False, check_stale=False
+    ):
         self._base_path = base_path
         self._prefix = prefix
+        self._check_stale = check_stale
+        self._snapshot = None
+        self._stamp = None
+        if snapshot:
+            self.reload()
+
+    def _get_stamp(self):
+        try:
+            stat = os.stat(self._base_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime)
+
+    def reload(self):
+        """
+        Read all the files in the directory into memory.
+
+        Returns the set of keys which were added, removed or changed since
+        the previous snapshot.
+        """
+        stamp = self._get_stamp()
+        values = {}
+        try:
+            entries = list(os.scandir(self._base_path))
+        except OSError as e:
+            if e.errno == errno.EACCES:  # Wrong permissions
+                raise
+            entries = []  # Directory does not exist
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            try:
+                with open(entry.path) as fh:
+                    values[entry.name] = fh.read()
+            except IOError as e:
+                if e.errno == errno.EACCES:  # Wrong permissions
+                    raise
+                # File was removed in the meantime
+
+        previous = self._snapshot or {}
+        changed = set(values) ^ set(previous)
+        changed.update(
+            k for k, v in values.items() if k in previous and previous[k] != v
+        )
+        self._snapshot, self._stamp = values, stamp
+        return changed
+
+    def invalidate(self, key=None):
+        """
+        Read the file for `key` again into the snapshot, or the whole
+        directory if no key is given (see `reload`).
+
+        Has no effect if lookups are not served from a snapshot.
+        """
+        if self._snapshot is None:
+            return
+        if key is None:
+            self.reload()
+            return
+        # Replace the snapshot rather than updating it in place, as it is
+        # read without locking
+        snapshot = dict(self._snapshot)
+        value = self._read(key)
+        if value is NOT_PROVIDED:
+            snapshot.pop(key, None)
+        else:
+            snapshot[key] = value
+        self._snapshot = snapshot
+
+    def _get_snapshot(self):
+        if self._check_stale and self._get_stamp() != self._stamp:
+            self.reload()
+        return self._snapshot
 
     def get(self, key):
+        if self._snapshot is not None:
+            return self._get_snapshot().get(key, NOT_PROVIDED)
+        return self._read(key)
+
+    def _read(self, key):
         path = os.path.join(self._base_path, key)
         try:
             with open(path) as fh:
@@ -51,28 +353,897 @@ class EnvDirConfig(ConfigurationProvider):
                 raise
             return NOT_PROVIDED  # File does not exist
 
+    def get_many(self, keys):
+        if self._snapshot is not None:
+            snapshot = self._get_snapshot()
+            return {key: snapshot.get(key, NOT_PROVIDED) for key in keys}
+
+        # List the directory once instead of trying to open each file
+        try:
+            existing = set(os.listdir(self._base_path))
+        except OSError as e:
+            if e.errno == errno.EACCES:  # Wrong permissions
+                raise
+            existing = set()  # Directory does not exist
+        return {
+            key: self.get(key) if key in existing else NOT_PROVIDED
+            for key in keys
+        }
+
     def iterprefixed(self, prefix):
         prefix = self._prefix + prefix
-        if os.path.exists(self._base_path):
+        if self._snapshot is not None:
+            for k, v in list(self._get_snapshot().items()):
+                if k.startswith(prefix):
+                    yield (k[len(self._prefix) :], v)
+        elif os.path.exists(self._base_path):
             for k in os.listdir(self._base_path):
                 path = os.path.join(self._base_path, k)
                 if k.startswith(prefix) and os.path.isfile(path):
                     yield (k[len(self._prefix) :], self.get(k))
 
 
+class EnvFileConfig(ConfigurationProvider):
+    """
+    Loads configuration values from a ``.env``-style file containing one
+    ``KEY=VALUE`` assignment per line.
+
+    The file is memory-mapped and scanned once to build an index of the
+    offsets of each value; values are only read and decoded when looked up.
+    Blank lines, lines starting with ``#`` and an ``export`` keyword before
+    the key are ignored. Values can be enclosed in single or double quotes;
+    unquoted values end at the first `` #``.
+
+    As the file stays mapped, it must be replaced atomically (e.g. with
+    `os.replace`) rather than modified in place; call `reload` afterwards to
+    read the new one.
+    """
+
+    __slots__ = ("_path", "_prefix", "_index")
+
+    def __init__(self, path, prefix=""):
+        self._path = path
+        self._prefix = prefix
+        self.reload()
+
+    def reload(self):
+        """
+        Map the file again and rebuild its index.
+        """
+        try:
+            with open(self._path, "rb") as fh:
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError) as e:
+            if getattr(e, "errno", None) == errno.EACCES:  # Wrong permissions
+                raise
+            # File does not exist or is empty
+            self._index = (None, {}, [])
+            return
+
+        offsets = {}
+        size = len(mapped)
+        start = 0
+        while start < size:
+            end = mapped.find(b"\n", start)
+            if end == -1:
+                end = size
+            separator = mapped.find(b"=", start, end)
+            if separator != -1:
+                key = mapped[start:separator].strip()
+                if key.startswith(b"export "):
+                    key = key[7:].lstrip()
+                if key and not key.startswith(b"#"):
+                    offsets[key.decode("utf-8")] = (separator + 1, end)
+            start = end + 1
+        self._index = (mapped, offsets, sorted(offsets))
+
+    @staticmethod
+    def _get_value(mapped, start, end):
+        value = mapped[start:end].strip()
+        if len(value) > 1 and value[:1] in b"'\"" and value[-1:] == value[:1]:
+            value = value[1:-1]
+        else:
+            comment = value.find(b" #")
+            if comment != -1:
+                value = value[:comment].rstrip()
+        return value.decode("utf-8")
+
+    def get(self, key):
+        mapped, offsets, _ = self._index
+        try:
+            start, end = offsets[self._prefix + key]
+        except KeyError:
+            return NOT_PROVIDED
+        return self._get_value(mapped, start, end)
+
+    def iterprefixed(self, prefix):
+        mapped, offsets, keys = self._index
+        for k in iter_sorted_prefixed(keys, self._prefix + prefix):
+            yield (
+                k[len(self._prefix) :],
+                self._get_value(mapped, *offsets[k]),
+            )
+
+
+# Layout of the snapshots shared by `SharedMemoryPublisher`: a header (magic,
+# flags, generation, number of entries), followed by one index entry per key
+# (offset and length of the key, offset and length of the value), sorted by
+# key, followed by the UTF-8 encoded keys and values.
+SHM_MAGIC = b"CFG1"
+SHM_SUPERSEDED = 1
+_shm_header = struct.Struct("<4sIQI")
+_shm_flags = struct.Struct("<I")
+_shm_entry = struct.Struct("<IIII")
+
+
+class SharedMemoryPublisher(object):
+    """
+    Publishes configuration values for `SharedMemoryConfig` readers.
+
+    The values are written to `path`, which should live on a memory-backed
+    filesystem (e.g. ``/dev/shm``) so that the readers map the same pages.
+    Each call to `publish` atomically replaces the file and flags the
+    previous one as superseded, so that readers switch to the new one on
+    their next lookup.
+    """
+
+    __slots__ = ("path",)
+
+    def __init__(self, path):
+        self.path = path
+
+    def get_generation(self):
+        """
+        Return the generation of the currently published snapshot, or 0 if
+        there is none.
+        """
+        try:
+            with open(self.path, "rb") as fh:
+                header = fh.read(_shm_header.size)
+        except (IOError, OSError):
+            return 0
+        if len(header) < _shm_header.size:
+            return 0
+        magic, _, generation, _ = _shm_header.unpack(header)
+        return generation if magic == SHM_MAGIC else 0
+
+    def publish(self, values):
+        """
+        Publish the `values` dictionary, mapping keys to string values (e.g.
+        the result of `Settings.provided_values`). Returns the generation of
+        the new snapshot.
+        """
+        import tempfile
+
+        items = sorted(
+            (k.encode("utf-8"), v.encode("utf-8")) for k, v in values.items()
+        )
+        generation = self.get_generation() + 1
+        offset = _shm_header.size + _shm_entry.size * len(items)
+        chunks = [_shm_header.pack(SHM_MAGIC, 0, generation, len(items))]
+        for k, v in items:
+            chunks.append(
+                _shm_entry.pack(offset, len(k), offset + len(k), len(v))
+            )
+            offset += len(k) + len(v)
+        for k, v in items:
+            chunks.extend((k, v))
+
+        dirname = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(b"".join(chunks))
+            try:
+                previous = open(self.path, "r+b")
+            except (IOError, OSError):
+                previous = None
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        if previous is not None:
+            with previous:
+                previous.seek(4)
+                previous.write(_shm_flags.pack(SHM_SUPERSEDED))
+        return generation
+
+
+class SharedMemoryConfig(ConfigurationProvider):
+    """
+    Loads configuration values from a snapshot written by
+    `SharedMemoryPublisher`.
+
+    The file is memory-mapped, so that all the processes reading it share
+    the same pages, and keys are looked up with a binary search in its
+    index; only the values which are read are copied. When a new snapshot is
+    published, the file is reopened on the next lookup. A missing, empty or
+    truncated file is treated as an empty snapshot.
+    """
+
+    __slots__ = ("_path", "_prefix", "_state")
+
+    def __init__(self, path, prefix=""):
+        self._path = path
+        self._prefix = prefix
+        self._state = None
+        self._open()
+
+    def _open(self):
+        try:
+            with open(self._path, "rb") as fh:
+                mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError) as e:
+            if getattr(e, "errno", None) == errno.EACCES:  # Wrong permissions
+                raise
+            self._state = None  # File does not exist or is empty
+            return None
+        if len(mapped) < _shm_header.size:
+            mapped.close()
+            self._state = None  # File is truncated
+            return None
+        magic, _, generation, count = _shm_header.unpack_from(mapped)
+        if magic != SHM_MAGIC:
+            raise ValueError(
+                "{} is not a configuration snapshot".format(self._path)
+            )
+        state = self._state = (mapped, count, generation)
+        return state
+
+    def _get_state(self):
+        state = self._state
+        if state is None:
+            return self._open()
+        if _shm_flags.unpack_from(state[0], 4)[0] & SHM_SUPERSEDED:
+            return self._open()
+        return state
+
+    @property
+    def generation(self):
+        """
+        The generation of the snapshot currently read, or 0 if there is none.
+        """
+        state = self._get_state()
+        return state[2] if state is not None else 0
+
+    @staticmethod
+    def _get_entry(mapped, index):
+        return _shm_entry.unpack_from(
+            mapped, _shm_header.size + index * _shm_entry.size
+        )
+
+    def _bisect(self, mapped, count, key):
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_offset, key_len, _, _ = self._get_entry(mapped, mid)
+            if mapped[key_offset : key_offset + key_len] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def get(self, key):
+        state = self._get_state()
+        if state is None:
+            return NOT_PROVIDED
+        mapped, count, _ = state
+        key = (self._prefix + key).encode("utf-8")
+        index = self._bisect(mapped, count, key)
+        if index < count:
+            key_offset, key_len, offset, length = self._get_entry(
+                mapped, index
+            )
+            if mapped[key_offset : key_offset + key_len] == key:
+                return mapped[offset : offset + length].decode("utf-8")
+        return NOT_PROVIDED
+
+    def iterprefixed(self, prefix):
+        state = self._get_state()
+        if state is None:
+            return
+        mapped, count, _ = state
+        prefix = (self._prefix + prefix).encode("utf-8")
+        skip = len(self._prefix.encode("utf-8"))
+        for index in range(self._bisect(mapped, count, prefix), count):
+            key_offset, key_len, offset, length = self._get_entry(
+                mapped, index
+            )
+            key = mapped[key_offset : key_offset + key_len]
+            if not key.startswith(prefix):
+                break
+            yield (
+                key[skip:].decode("utf-8"),
+                mapped[offset : offset + length].decode("utf-8"),
+            )
+
+
+class HTTPKVConfig(ConfigurationProvider):
+    """
+    Loads configuration values from a Consul-style HTTP key-value store.
+
+    Single keys are read with ``GET <url>/<key>?raw`` (a 404 meaning that
+    the key is not set) and prefixes with ``GET <url>/<prefix>?recurse``,
+    which returns a JSON list of objects with base64 encoded values. Batch
+    lookups through `get_many` fetch all the keys under `prefix` with a
+    single request.
+
+    The `url` points to the key-value endpoint (e.g.
+    ``http://localhost:8500/v1/kv``) and may include a key path, under which
+    all the keys are looked up.
+
+    Requests go through a pool of at most `pool_size` idle persistent
+    connections (not shared with forked processes), and responses (including
+    missing keys) are cached for `ttl` seconds; call `invalidate` to drop
+    them earlier. If given, `token` is sent in the ``X-Consul-Token`` header.
+    """
+
+    __slots__ = (
+        "_scheme",
+        "_netloc",
+        "_path",
+        "_keypath",
+        "_prefix",
+        "_ttl",
+        "_timeout",
+        "_pool_size",
+        "_headers",
+        "_pool",
+        "_pool_lock",
+        "_pool_pid",
+        "_values",
+        "_prefixes",
+    )
+
+    def __init__(
+        self,
+        url,
+        prefix="",
+        ttl=60.0,
+        timeout=10.0,
+        pool_size=4,
+        token=None,
+    ):
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._path = parts.path.rstrip("/") + "/"
+        # Keys returned by recursive lookups are relative to the API root and
+        # thus include any key path given as part of the URL
+        root, sep, keypath = self._path.partition("/v1/kv/")
+        self._keypath = keypath if sep else ""
+        self._prefix = prefix
+        self._ttl = ttl
+        self._timeout = timeout
+        self._pool_size = pool_size
+        self._headers = {"X-Consul-Token": token} if token else {}
+        self._pool = []
+        self._pool_lock = allocate_lock()
+        self._pool_pid = os.getpid()
+        self._values = {}
+        self._prefixes = {}
+
+    def invalidate(self, key=None):
+        """
+        Drop the cached responses for `key`, or all of them if no key is
+        given.
+        """
+        if key is None:
+            self._values.clear()
+            self._prefixes.clear()
+            return
+        key = self._prefix + key
+        self._values.pop(key, None)
+        for prefix in [p for p in self._prefixes if key.startswith(p)]:
+            self._prefixes.pop(prefix, None)
+
+    def close(self):
+        """
+        Close the idle connections of the pool.
+        """
+        with self._pool_lock:
+            pool, self._pool = self._pool, []
+        for connection in pool:
+            connection.close()
+
+    def _connect(self):
+        import http.client
+
+        if self._scheme == "https":
+            factory = http.client.HTTPSConnection
+        else:
+            factory = http.client.HTTPConnection
+        return factory(self._netloc, timeout=self._timeout)
+
+    def _request(self, key, query):
+        import http.client
+        from urllib.parse import quote
+
+        path = "{}{}?{}".format(self._path, quote(key, safe="/"), query)
+        if self._pool_pid != os.getpid():
+            # The pooled connections of a forked process share their sockets
+            # with the parent process and can't be used; closing the copies
+            # inherited by this process leaves those of the parent open
+            pool, self._pool = self._pool, []
+            self._pool_pid = os.getpid()
+            self._pool_lock = allocate_lock()
+            for connection in pool:
+                connection.close()
+        with self._pool_lock:
+            connection = self._pool.pop() if self._pool else None
+        # A pooled connection may have been closed by the server in the
+        # meantime, in which case the request is retried on a new one
+        retry = connection is not None
+        while True:
+            if connection is None:
+                connection = self._connect()
+            try:
+                connection.request("GET", path, headers=self._headers)
+                response = connection.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                if not retry:
+                    raise
+                connection, retry = None, False
+            else:
+                break
+
+        if response.will_close:
+            connection.close()
+        else:
+            with self._pool_lock:
+                if len(self._pool) < self._pool_size:
+                    self._pool.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            raise IOError(
+                "GET {} returned {} {}".format(
+                    path, response.status, response.reason
+                )
+            )
+        return body
+
+    def get(self, key):
+        key = self._prefix + key
+        cached = self._values.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        body = self._request(key, "raw")
+        value = NOT_PROVIDED if body is None else body.decode("utf-8")
+        self._values[key] = (time.monotonic() + self._ttl, value)
+        return value
+
+    def _get_prefixed(self, prefix):
+        import base64
+        import json
+
+        cached = self._prefixes.get(prefix)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        body = self._request(prefix, "recurse")
+        entries = json.loads(body.decode("utf-8")) if body else []
+        items = []
+        start = len(self._keypath)
+        for entry in entries:
+            if entry.get("Value") is not None:
+                value = base64.b64decode(entry["Value"]).decode("utf-8")
+                items.append((entry["Key"][start:], value))
+        expires = time.monotonic() + self._ttl
+        self._prefixes[prefix] = (expires, items)
+        return items
+
+    def get_many(self, keys):
+        keys = list(keys)
+        if len(keys) < 2:
+            return {key: self.get(key) for key in keys}
+        now = time.monotonic()
+        values, missing = {}, []
+        for key in keys:
+            cached = self._values.get(self._prefix + key)
+            if cached is not None and cached[0] > now:
+                values[key] = cached[1]
+            else:
+                missing.append(key)
+        if missing:
+            found = dict(self._get_prefixed(self._prefix))
+            expires = time.monotonic() + self._ttl
+            for key in missing:
+                value = found.get(self._prefix + key, NOT_PROVIDED)
+                self._values[self._prefix + key] = (expires, value)
+                values[key] = value
+        return values
+
+    def iterprefixed(self, prefix):
+        for k, v in self._get_prefixed(self._prefix + prefix):
+            yield (k[len(self._prefix) :], v)
+
+
+class RedisError(IOError):
+    """
+    Error reply of a Redis server.
+    """
+
+
+class RedisConnection(object):
+    """
+    Minimal client for the Redis protocol (RESP), supporting pipelining.
+    """
+
+    __slots__ = ("_sock", "_file")
+
+    def __init__(self, host, port, db=0, password=None, timeout=10.0):
+        import socket
+
+        self._sock = socket.create_connection((host, port), timeout)
+        self._file = self._sock.makefile("rb")
+        commands = []
+        if password:
+            commands.append(("AUTH", password))
+        if db:
+            commands.append(("SELECT", db))
+        if commands:
+            self.execute_many(commands)
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    @staticmethod
+    def _encode(args):
+        chunks = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            chunks.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(chunks)
+
+    def _read_reply(self):
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by the server")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload
+        elif kind == b"-":
+            return RedisError(payload.decode("utf-8", "replace"))
+        elif kind == b":":
+            return int(payload)
+        elif kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._file.read(length + 2)
+            if len(data) != length + 2:
+                raise ConnectionError("connection closed by the server")
+            return data[:-2]
+        elif kind == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+        raise ConnectionError("unexpected reply: {!r}".format(line))
+
+    def execute_many(self, commands):
+        """
+        Send all of `commands` (sequences of arguments) at once and return
+        the list of their replies.
+        """
+        self._sock.sendall(b"".join(self._encode(c) for c in commands))
+        replies = [self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+
+class RedisConnectionPool(object):
+    """
+    Keeps up to `max_idle` idle connections to a Redis server for reuse.
+
+    The connections inherited by a forked process are closed, rather than
+    shared with the parent process.
+    """
+
+    __slots__ = ("_args", "_max_idle", "_idle", "_lock", "_pid")
+
+    def __init__(
+        self, host, port, db=0, password=None, timeout=10.0, max_idle=4
+    ):
+        self._args = (host, port, db, password, timeout)
+        self._max_idle = max_idle
+        self._idle = []
+        self._lock = allocate_lock()
+        self._pid = os.getpid()
+
+    def execute_many(self, commands):
+        """
+        Run `commands` in a pipeline on one of the connections of the pool.
+        """
+        if self._pid != os.getpid():
+            # The idle connections of a forked process share their sockets
+            # with the parent process and can't be used; closing the copies
+            # inherited by this process leaves those of the parent open
+            idle, self._idle = self._idle, []
+            self._pid = os.getpid()
+            self._lock = allocate_lock()
+            for connection in idle:
+                connection.close()
+        with self._lock:
+            connection = self._idle.pop() if self._idle else None
+        # A pooled connection may have been closed by the server in the
+        # meantime, in which case the commands are retried on a new one
+        retry = connection is not None
+        while True:
+            if connection is None:
+                connection = RedisConnection(*self._args)
+            try:
+                replies = connection.execute_many(commands)
+            except RedisError:
+                self._release(connection)
+                raise
+            except OSError:
+                connection.close()
+                if not retry:
+                    raise
+                connection, retry = None, False
+            else:
+                self._release(connection)
+                return replies
+
+    def _release(self, connection):
+        with self._lock:
+            if len(self._idle) < self._max_idle:
+                self._idle.append(connection)
+                return
+        connection.close()
+
+    def close(self):
+        """
+        Close the idle connections.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+_redis_pools = {}
+_redis_pools_lock = allocate_lock()
+
+
+def get_redis_pool(host="localhost", port=6379, db=0, password=None, **kwargs):
+    """
+    Return the connection pool shared by all the providers using the same
+    Redis server and database, creating it if needed.
+    """
+    key = (host, port, db, password)
+    with _redis_pools_lock:
+        try:
+            return _redis_pools[key]
+        except KeyError:
+            pool = _redis_pools[key] = RedisConnectionPool(
+                host, port, db, password, **kwargs
+            )
+            return pool
+
+
+def escape_glob(pattern):
+    """
+    Escape the characters having a special meaning in Redis glob patterns.
+    """
+    for char in "\\*?[]":
+        pattern = pattern.replace(char, "\\" + char)
+    return pattern
+
+
+class RedisConfig(ConfigurationProvider):
+    """
+    Loads configuration values from a Redis server, given as a
+    ``redis://[:password@]host[:port][/db]`` URL.
+
+    Batch lookups through `get_many` send pipelined ``MGET`` commands of at
+    most `batch_size` keys each, and prefix lookups iterate over the
+    matching keys with ``SCAN`` (fetching `scan_count` keys per call) so as
+    not to block the server. Connections are taken from a pool shared by
+    all the providers using the same server (see `get_redis_pool`).
+    """
+
+    __slots__ = ("_pool", "_prefix", "_batch_size", "_scan_count")
+
+    def __init__(
+        self,
+        url="redis://localhost",
+        prefix="",
+        batch_size=500,
+        scan_count=1000,
+    ):
+        from urllib.parse import unquote, urlsplit
+
+        parts = urlsplit(url)
+        db = parts.path.strip("/")
+        password = parts.password
+        self._pool = get_redis_pool(
+            parts.hostname or "localhost",
+            parts.port or 6379,
+            int(db) if db else 0,
+            unquote(password) if password else None,
+        )
+        self._prefix = prefix
+        self._batch_size = batch_size
+        self._scan_count = scan_count
+
+    def get(self, key):
+        (value,) = self._pool.execute_many([("GET", self._prefix + key)])
+        return NOT_PROVIDED if value is None else value.decode("utf-8")
+
+    def _mget(self, keys):
+        size = self._batch_size
+        commands = [
+            ("MGET",) + tuple(keys[i : i + size])
+            for i in range(0, len(keys), size)
+        ]
+        values = []
+        for reply in self._pool.execute_many(commands) if commands else ():
+            values.extend(reply)
+        return values
+
+    def get_many(self, keys):
+        keys = list(keys)
+        values = self._mget([self._prefix + key for key in keys])
+        return {
+            key: NOT_PROVIDED if value is None else value.decode("utf-8")
+            for key, value in zip(keys, values)
+        }
+
+    def iterprefixed(self, prefix):
+        prefix = self._prefix + prefix
+        pattern = escape_glob(prefix) + "*"
+        keys, cursor = set(), b"0"
+        while True:
+            cursor, found = self._pool.execute_many(
+                [("SCAN", cursor, "MATCH", pattern, "COUNT", self._scan_count)]
+            )[0]
+            keys.update(found)
+            if cursor == b"0":
+                break
+        keys = sorted(k.decode("utf-8") for k in keys)
+        for k, v in zip(keys, self._mget(keys)):
+            if v is not None:  # Deleted meanwhile, or not a string
+                yield (k[len(self._prefix) :], v.decode("utf-8"))
+
+
 class FallbackProvider(ConfigurationProvider):
-    def __init__(self, providers):
+    """
+    Looks up values in each of the passed providers in turn and returns the
+    first one found.
+
+    If `cache` is true, the provider which answered each key is remembered
+    and subsequent lookups for that key only query it; keys none of the
+    providers know about are remembered as missing. Call `invalidate` when
+    keys are added to or removed from the underlying providers.
+
+    If a `stats.SettingsStats` instance is passed as `stats`, the hits and
+    misses of each provider are recorded in it.
+    """
+
+    __slots__ = ("_providers", "_cache", "_stats", "_layers")
+
+    def __init__(self, providers, cache=False, stats=None):
         self._providers = list(providers)
+        self._cache = {} if cache else None
+        self._stats = stats
+        self._layers = [
+            "{}:{}".format(i, provider.__class__.__name__)
+            for i, provider in enumerate(self._providers)
+        ]
 
-    def get(self, key):
+    def invalidate(self, key=None):
+        """
+        Forget where `key`, or all keys if none is given, was found, and pass
+        the call on to the providers having an `invalidate` method.
+        """
         for provider in self._providers:
-            value = provider.get(key)
+            invalidate = getattr(provider, "invalidate", None)
+            if invalidate is not None:
+                invalidate(key)
+        if self._cache is None:
+            return
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+
+    def _lookup(self, index, key):
+        value = self._providers[index].get(key)
+        if self._stats is not None:
+            self._stats.record_lookup(
+                self._layers[index], value is not NOT_PROVIDED
+            )
+        return value
+
+    def _lookup_many(self, index, keys):
+        values = self._providers[index].get_many(keys)
+        if self._stats is not None:
+            for key in keys:
+                self._stats.record_lookup(
+                    self._layers[index], values[key] is not NOT_PROVIDED
+                )
+        return values
+
+    def get(self, key):
+        cache = self._cache
+        if cache is not None:
+            index = cache.get(key)
+            if index is NOT_PROVIDED:
+                return NOT_PROVIDED
+            elif index is not None:
+                value = self._lookup(index, key)
+                if value is not NOT_PROVIDED:
+                    return value
+
+        for index in range(len(self._providers)):
+            value = self._lookup(index, key)
             if value is not NOT_PROVIDED:
                 break
         else:
-            value = NOT_PROVIDED
+            value = index = NOT_PROVIDED
+        if cache is not None:
+            cache[key] = index
         return value
 
+    def get_many(self, keys):
+        cache = self._cache
+        values = {}
+        pending = []
+
+        if cache is None:
+            pending.extend(keys)
+        else:
+            cached = {}
+            for key in keys:
+                index = cache.get(key)
+                if index is NOT_PROVIDED:
+                    values[key] = NOT_PROVIDED
+                elif index is None:
+                    pending.append(key)
+                else:
+                    cached.setdefault(index, []).append(key)
+            for index, provider_keys in cached.items():
+                found = self._lookup_many(index, provider_keys)
+                for key in provider_keys:
+                    if found[key] is NOT_PROVIDED:
+                        pending.append(key)
+                    else:
+                        values[key] = found[key]
+
+        for index in range(len(self._providers)):
+            if not pending:
+                break
+            found = self._lookup_many(index, pending)
+            missing = []
+            for key in pending:
+                if found[key] is NOT_PROVIDED:
+                    missing.append(key)
+                else:
+                    values[key] = found[key]
+                    if cache is not None:
+                        cache[key] = index
+            pending = missing
+
+        for key in pending:
+            values[key] = NOT_PROVIDED
+            if cache is not None:
+                cache[key] = NOT_PROVIDED
+        return values
+
     def iterprefixed(self, prefix):
         seen = set()
         for provider in self._providers:
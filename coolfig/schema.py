@@ -1,6 +1,16 @@
-from six import iteritems, with_metaclass
+import gc
+import os
+import time
+import weakref
+from _thread import allocate_lock
 
-from .providers import NOT_PROVIDED
+from .providers import NOT_PROVIDED, FallbackProvider
+
+try:
+    # Avoid importing threading, which is comparatively slow to import
+    from _thread import _local as local
+except ImportError:  # NOCOV
+    from threading import local
 
 
 class ImproperlyConfigured(Exception):
@@ -9,23 +19,70 @@ class ImproperlyConfigured(Exception):
     """
 
 
+class ValidationError(ImproperlyConfigured):
+    """
+    Raised by `SettingsBase.validate` with all the errors encountered, as a
+    dictionary mapping each invalid setting to its exception.
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        lines = ["  {}: {}".format(k, errors[k]) for k in sorted(errors)]
+        super(ValidationError, self).__init__(
+            "invalid configuration:\n{}".format("\n".join(lines))
+        )
+
+
 class ValueBase(object):
+    __slots__ = ()
+
     def __call__(self, settingsobj, key):  # NOCOV
         raise NotImplementedError
 
+    def provider_key(self, key):
+        """
+        Return the provider key this value is read from when bound to `key`,
+        or None if it is not read from a single provider key.
+        """
+        return None
+
+    def provider_prefix(self, key):
+        """
+        Return the prefix of the provider keys this value is read from when
+        bound to `key`, or None if it is not read from prefixed keys.
+        """
+        return None
+
 
 class Value(ValueBase):
-    def __init__(self, type, default=NOT_PROVIDED, key=None):
+    __slots__ = ("type", "default", "key", "volatile")
+
+    def __init__(self, type, default=NOT_PROVIDED, key=None, volatile=False):
+        """
+        Values flagged as `volatile` are resolved again in each worker
+        process after `SettingsBase.prefork` (e.g. rotated credentials).
+        """
         self.type = type
         self.default = default
         self.key = key
+        self.volatile = volatile
 
     def _get_provided_value(self, settingsobj, key):
         return settingsobj.config_provider.get(key)
 
+    def provider_key(self, key):
+        return self.key if self.key else key
+
     def __call__(self, settingsobj, key):
-        key = self.key if self.key else key
+        key = self.provider_key(key)
         value = self._get_provided_value(settingsobj, key)
+        return self.resolve(settingsobj, key, value)
+
+    def resolve(self, settingsobj, key, value):
+        """
+        Turn the raw `value` read from the provider for `key` into the final
+        value of the setting.
+        """
         if value is NOT_PROVIDED and self.default is NOT_PROVIDED:
             # Value is required but was not provided
             raise ImproperlyConfigured("no value set for {}".format(key))
@@ -37,10 +94,32 @@ class Value(ValueBase):
                 return self.default
         else:
             # Coerce to the correct type and return it
+            return self.coerce(settingsobj, value)
+
+    def coerce(self, settingsobj, value):
+        stats = settingsobj._stats
+        if stats is None:
+            return self.type(value)
+        start = time.perf_counter()
+        try:
             return self.type(value)
+        finally:
+            stats.record_coercion(self.type, time.perf_counter() - start)
+
+
+def _reads_provided_value(value):
+    """
+    Whether `value` is read from its provider key the way `Value` does it, so
+    that it can be resolved from the result of a batched lookup.
+    """
+    cls = type(value)
+    read = getattr(cls, "_get_provided_value", None)
+    return read is Value._get_provided_value and cls.__call__ is Value.__call__
 
 
 class ComputedValue(ValueBase):
+    __slots__ = ("callable", "args", "kwargs")
+
     def __init__(self, callable, *args, **kwargs):
         self.callable = callable
         self.args = args
@@ -55,42 +134,111 @@ def computed_value(func):
 
 
 class DictValue(Value):
+    __slots__ = ("keytype",)
+
     def __init__(self, type, keytype=str, *args, **kwargs):
         super(DictValue, self).__init__(type, *args, **kwargs)
         self.keytype = keytype
 
+    def provider_key(self, key):
+        return None
+
+    def provider_prefix(self, key):
+        return (self.key if self.key else key) + "_"
+
     def __call__(self, settingsobj, key):
-        key = (self.key if self.key else key) + "_"
+        key = self.provider_prefix(key)
         return {
-            self.keytype(k[len(key) :]): self.type(v)
+            self.keytype(k[len(key) :]): self.coerce(settingsobj, v)
             for k, v in settingsobj.config_provider.iterprefixed(key)
         }
 
 
 class Dictionary(ValueBase):
+    __slots__ = ("spec",)
+
     def __init__(self, spec):
         self.spec = spec
 
     def __call__(self, settingsobj, key):
         return {
-            key: value(settingsobj, key) for key, value in iteritems(self.spec)
+            key: value(settingsobj, key) for key, value in self.spec.items()
         }
 
 
 class BoundValue(object):
+    __slots__ = ("cls", "name", "value", "derived")
+
     def __init__(self, cls, name, value):
         self.cls = cls
         self.name = name
         self.value = value
+        # Plain values do not read other settings, so there is no need to
+        # track what is accessed while they are resolved
+        if type(value) in (Value, DictValue):
+            self.derived = isinstance(value.default, Reference)
+        else:
+            self.derived = True
 
     def __get__(self, obj, objtype=None):
         if obj is None:
             return self
-        return self.value(obj, self.name)
+        cache = obj._cache
+        if obj._stats is not None:
+            return self._get_instrumented(obj, cache)
+        if cache is None:
+            return self.resolve(obj, self.value, obj, self.name)
+        try:
+            value = cache[self.name]
+        except KeyError:
+            value = cache[self.name] = self.resolve(
+                obj, self.value, obj, self.name
+            )
+        else:
+            if obj._resolving:
+                obj._add_dependency(self.name)
+        return value
+
+    def _get_instrumented(self, obj, cache):
+        stats = obj._stats
+        stats.record_access(self.name)
+        if cache is not None:
+            try:
+                value = cache[self.name]
+            except KeyError:
+                pass
+            else:
+                if obj._resolving:
+                    obj._add_dependency(self.name)
+                return value
+        start = time.perf_counter()
+        value = self.resolve(obj, self.value, obj, self.name)
+        stats.record_resolution(self.name, time.perf_counter() - start)
+        if cache is not None:
+            cache[self.name] = value
+        return value
+
+    def resolve(self, obj, func, *args):
+        """
+        Call `func` with `args` to resolve this value for the settings
+        instance `obj`, recording the dependencies between settings.
+        """
+        if self.derived:
+            return obj._resolve(self.name, func, *args)
+        value = func(*args)
+        if obj._resolving:
+            obj._add_dependency(self.name)
+        return value
 
     def __set__(self, obj, objtype=None):
         raise AttributeError("can't set attribute")
 
+    def provider_key(self):
+        return self.value.provider_key(self.name)
+
+    def provider_prefix(self):
+        return self.value.provider_prefix(self.name)
+
     def __repr__(self):  # NOCOV
         return "BoundValue({}, {}) of class {}".format(
             self.name, self.value.type, self.cls.__name__
@@ -98,6 +246,8 @@ class BoundValue(object):
 
 
 class StaticValue(BoundValue):
+    __slots__ = ()
+
     def __init__(self, value):
         self.value = value
 
@@ -106,11 +256,19 @@ class StaticValue(BoundValue):
             return self
         return self.value
 
+    def provider_key(self):
+        return None
+
+    def provider_prefix(self):
+        return None
+
     def __repr__(self):  # NOCOV
         return "StaticValue({!r})".format(self.value)
 
 
 class Reference(object):
+    __slots__ = ("key",)
+
     def __init__(self, key):
         self.key = key
 
@@ -127,31 +285,302 @@ def bind_values(cls, clsdict):
             setattr(cls, k, BoundValue(cls, k, v))
 
 
+def lookup_attribute(cls, key):
+    """
+    Return the attribute `key` as found in the `__dict__` of `cls` or of the
+    first class in its MRO defining it, without invoking descriptors.
+    """
+    for klass in cls.__mro__:
+        if key in klass.__dict__:
+            return klass.__dict__[key]
+    return None
+
+
 class SettingsMeta(type):
+    """
+    Binds the values of the schema and keeps an index of them up to date, so
+    that iterating over a settings class does not need any reflection.
+    """
+
     def __init__(cls, name, bases, clsdict):
         for base in bases:
             if not isinstance(base, cls.__class__):
                 bind_values(cls, base.__dict__)
         bind_values(cls, clsdict)
+        bound_values = {}
+        for klass in reversed(cls.__mro__):
+            for k, v in klass.__dict__.items():
+                if isinstance(v, BoundValue):
+                    bound_values[k] = v
+                else:
+                    bound_values.pop(k, None)
+        type.__setattr__(cls, "_bound_values", bound_values)
+        type.__setattr__(cls, "_bound_keys", None)
+        type.__setattr__(cls, "_provider_index", None)
         return super(SettingsMeta, cls).__init__(name, bases, clsdict)
 
+    def __setattr__(cls, key, value):
+        super(SettingsMeta, cls).__setattr__(key, value)
+        cls._reindex(key)
+
+    def __delattr__(cls, key):
+        super(SettingsMeta, cls).__delattr__(key)
+        cls._reindex(key)
+
+    def _reindex(cls, key):
+        if "_bound_values" not in cls.__dict__:
+            # Values are still being bound, the index is built afterwards
+            return
+        value = lookup_attribute(cls, key)
+        if isinstance(value, BoundValue):
+            cls._bound_values[key] = value
+        else:
+            cls._bound_values.pop(key, None)
+        type.__setattr__(cls, "_bound_keys", None)
+        type.__setattr__(cls, "_provider_index", None)
+        for subclass in cls.__subclasses__():
+            if key not in subclass.__dict__ and isinstance(
+                subclass, SettingsMeta
+            ):
+                subclass._reindex(key)
+
     def __iter__(self):
-        for k in dir(self):
-            v = getattr(self, k, None)
-            if isinstance(v, BoundValue):
-                yield k, v
+        keys = self._bound_keys
+        if keys is None:
+            keys = tuple(sorted(self._bound_values))
+            type.__setattr__(self, "_bound_keys", keys)
+        bound_values = self._bound_values
+        for k in keys:
+            yield k, bound_values[k]
+
+
+_tracking_lock = allocate_lock()
 
 
 class SettingsBase(object):
-    def __init__(self, config_provider):
+    _cache = None
+    _stats = None
+    _change_callbacks = ()
+    _postfork_registered = False
+    _resolving = 0
+    _provider_index = None
+    _overlays = ()
+    _graph_version = 0
+
+    def __init__(self, config_provider, cache=False, stats=None):
+        """
+        Bind the schema to `config_provider`.
+
+        If `cache` is true, each value is resolved only once on first access
+        and memoized on this instance until `invalidate` is called. If a
+        `stats.SettingsStats` instance is passed as `stats`, accesses,
+        resolution and coercion times are recorded in it.
+        """
         self.config_provider = config_provider
+        if cache:
+            self._cache = {}
+        self._stats = stats
+        self._dependents = {}
+        self._local = local()
+        self._lock = allocate_lock()
+
+    def _tracking_state(self):
+        """
+        Return the thread-local storage, the lock and the dependents mapping
+        used to track dependencies, setting them up first for subclasses
+        overriding __init__ without calling this one.
+        """
+        state = self.__dict__
+        try:
+            return state["_local"], state["_lock"], state["_dependents"]
+        except KeyError:
+            pass
+        with _tracking_lock:
+            state.setdefault("_dependents", {})
+            state.setdefault("_local", local())
+            state.setdefault("_lock", allocate_lock())
+        return state["_local"], state["_lock"], state["_dependents"]
+
+    def _resolve(self, name, func, *args):
+        """
+        Call `func` with `args` to resolve the setting `name`, keeping track
+        of the settings accessed in the meantime as its dependencies.
+
+        Raises `ImproperlyConfigured` if `name` is already being resolved by
+        the current thread, i.e. if settings reference each other.
+        """
+        local, lock, dependents = self._tracking_state()
+        try:
+            stack = local.stack
+        except AttributeError:
+            stack = local.stack = []
+        if name in stack:
+            chain = stack[stack.index(name) :] + [name]
+            raise ImproperlyConfigured(
+                "circular reference: {}".format(" -> ".join(chain))
+            )
+        if stack:
+            self._add_dependent(dependents, name, stack[-1])
+        with lock:
+            self._resolving += 1
+        stack.append(name)
+        try:
+            return func(*args)
+        finally:
+            stack.pop()
+            with lock:
+                self._resolving -= 1
+
+    def _add_dependency(self, name):
+        """
+        Record that the setting being resolved by the current thread, if
+        any, depends on `name`.
+        """
+        local, lock, dependents = self._tracking_state()
+        stack = getattr(local, "stack", None)
+        if stack:
+            self._add_dependent(dependents, name, stack[-1])
+
+    def _add_dependent(self, dependents, name, dependent):
+        names = dependents.setdefault(name, set())
+        if dependent not in names:
+            names.add(dependent)
+            # Lets overlays know that they have to recompute which settings
+            # they must resolve themselves
+            self._graph_version += 1
+
+    def dependents(self, key):
+        """
+        Return the names of the settings which were resolved from the value
+        of `key`, directly or indirectly.
+
+        Dependencies are recorded as values are resolved, so settings which
+        were never accessed are not included.
+        """
+        graph = self._tracking_state()[2]
+        dependents, pending = set(), [key]
+        while pending:
+            for name in graph.get(pending.pop(), ()):
+                if name not in dependents:
+                    dependents.add(name)
+                    pending.append(name)
+        dependents.discard(key)
+        return dependents
+
+    def invalidate(self, key=None):
+        """
+        Drop the memoized value for `key` and for the settings depending on
+        it, or all of them if no key is given.
+
+        The values cached by the overlays of this instance (see `overlay`)
+        which depend on `key` are dropped as well. Has no effect on this
+        instance itself if caching is not enabled on it.
+        """
+        if key is None:
+            dependents = ()
+        else:
+            dependents = self.dependents(key)
+        for overlay in list(self._overlays):
+            if key is None:
+                overlay.invalidate()
+            else:
+                overlay.invalidate(key)
+                for name in dependents:
+                    overlay.invalidate(name)
+        if self._cache is None:
+            return
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(key, None)
+            for name in dependents:
+                self._cache.pop(name, None)
+
+    def add_change_callback(self, callback):
+        """
+        Register `callback` to be called with this instance and the set of
+        affected settings names each time `notify_changed` is called.
+        """
+        if not self._change_callbacks:
+            self._change_callbacks = []
+        self._change_callbacks.append(callback)
+
+    def notify_changed(self, keys):
+        """
+        Signal that the provider keys in `keys` changed.
+
+        Invalidates the cached settings read from those keys as well as the
+        settings derived from them (see `dependents`) and, if the provider
+        has an `invalidate` method, its own cached lookups of those keys,
+        then notifies the registered callbacks. The overlays of this instance
+        are notified in turn. Returns the set of affected settings names.
+        """
+        keys = set(keys)
+        changed = set()
+        for k, v in self:
+            key, prefix = v.provider_key(), v.provider_prefix()
+            if key is not None:
+                if key in keys:
+                    changed.add(k)
+            elif prefix is not None:
+                if any(key.startswith(prefix) for key in keys):
+                    changed.add(k)
+        self._invalidate_provider(keys)
+        for k in list(changed):
+            changed.update(self.dependents(k))
+        for k in changed:
+            self.invalidate(k)
+        for callback in self._change_callbacks:
+            callback(self, changed)
+        for overlay in list(self._overlays):
+            overlay.notify_changed(keys)
+        return changed
+
+    def _invalidate_provider(self, keys):
+        """
+        Drop the lookups of the provider keys in `keys` cached by the
+        provider, if it has an `invalidate` method (a key of None stands for
+        all of them).
+        """
+        invalidate = getattr(self.config_provider, "invalidate", None)
+        if invalidate is not None:
+            for key in keys:
+                invalidate(key)
 
     def __iter__(self):
         return iter(self.__class__)
 
     def items(self):
-        for k, v in self:
-            yield k, getattr(self, k)
+        """
+        Yield the name and the value of each setting.
+
+        The values read from a single provider key are fetched with a single
+        call to the `get_many` method of the provider, unless their class
+        overrides how the provided value is read.
+        """
+        schema = list(self)
+        cache, stats = self._cache, self._stats
+        keys = {}
+        for k, v in schema:
+            if cache is None or k not in cache:
+                key = v.provider_key()
+                if key is not None and _reads_provided_value(v.value):
+                    keys[k] = key
+        provided = self.config_provider.get_many(set(keys.values()))
+        for k, v in schema:
+            if k in keys:
+                start = time.perf_counter()
+                value = v.resolve(
+                    self, v.value.resolve, self, keys[k], provided[keys[k]]
+                )
+                if stats is not None:
+                    stats.record_access(k)
+                    stats.record_resolution(k, time.perf_counter() - start)
+                if cache is not None:
+                    cache[k] = value
+            else:
+                value = getattr(self, k)
+            yield k, value
 
     def keys(self):
         for k, v in self:
@@ -160,8 +589,303 @@ class SettingsBase(object):
     def as_dict(self):
         return dict(self.items())
 
+    def validate(self, parallel=False, max_workers=None):
+        """
+        Resolve all values, collecting every error instead of stopping at the
+        first one.
+
+        If `parallel` is true, the values are resolved concurrently in a pool
+        of `max_workers` threads, which pays off for types doing imports or
+        I/O. Returns a dictionary mapping the name of each setting to the
+        time, in seconds, it took to resolve it; raises a `ValidationError`
+        if any value could not be resolved.
+        """
+
+        def check(key):
+            start = time.perf_counter()
+            try:
+                getattr(self, key)
+            except Exception as e:
+                error = e
+            else:
+                error = None
+            return key, time.perf_counter() - start, error
+
+        keys = list(self.keys())
+        if parallel:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers) as executor:
+                results = list(executor.map(check, keys))
+        else:
+            results = [check(key) for key in keys]
+
+        errors = {k: error for k, _, error in results if error is not None}
+        if errors:
+            raise ValidationError(errors)
+        return {k: elapsed for k, elapsed, _ in results}
+
+    def provider_lookups(self):
+        """
+        Return the set of provider keys and the set of key prefixes the
+        values of this schema are read from.
+        """
+        keys, prefixes = set(), set()
+        for k, v in self:
+            key, prefix = v.provider_key(), v.provider_prefix()
+            if key is not None:
+                keys.add(key)
+            if prefix is not None:
+                prefixes.add(prefix)
+        return keys, prefixes
+
+    def provided_values(self):
+        """
+        Return the raw values the provider holds for this schema, as a
+        dictionary mapping provider keys to values. Keys which are not
+        provided are omitted.
+        """
+        keys, prefixes = self.provider_lookups()
+        provided = self.config_provider.get_many(keys)
+        values = {k: v for k, v in provided.items() if v is not NOT_PROVIDED}
+        for prefix in prefixes:
+            values.update(self.config_provider.iterprefixed(prefix))
+        return values
+
+    def prefork(self, freeze_gc=True):
+        """
+        Resolve all values before forking worker processes.
+
+        Enables caching on this instance if needed and resolves every value
+        into the cache, so that forked workers share the resolved settings
+        copy-on-write instead of each reading the provider again. If
+        `freeze_gc` is true, `gc.freeze` is called so that the collector
+        does not touch (and thus copy) the pages holding them in the
+        workers. Where supported, `postfork` is registered to run in each
+        child process. Returns this instance.
+        """
+        if self._cache is None:
+            self._cache = {}
+        self.as_dict()
+        if freeze_gc and hasattr(gc, "freeze"):
+            gc.freeze()
+        if not self._postfork_registered and hasattr(os, "register_at_fork"):
+            ref = weakref.ref(self)
+
+            def after_in_child():
+                settings = ref()
+                if settings is not None:
+                    settings.postfork()
+
+            os.register_at_fork(after_in_child=after_in_child)
+            self._postfork_registered = True
+        return self
+
+    def volatile_keys(self):
+        """
+        Return the names of the settings flagged as volatile.
+        """
+        keys = []
+        for k, v in self:
+            if isinstance(v, StaticValue):
+                continue
+            if getattr(v.value, "volatile", False):
+                keys.append(k)
+        return keys
+
+    def postfork(self):
+        """
+        Resolve the volatile values again, after forking a worker process.
+
+        Called automatically in the children after `prefork`. The lookups of
+        the corresponding provider keys cached by the provider are dropped
+        first (e.g. re-reading them into an `EnvDirConfig` snapshot). Returns
+        the names of the settings which were resolved again.
+        """
+        keys = self.volatile_keys()
+        bound_values = dict(iter(self))
+        # Values read from prefixed keys have no provider key, in which case
+        # all the lookups of the provider are dropped
+        self._invalidate_provider(
+            {bound_values[k].provider_key() for k in keys}
+        )
+        for k in keys:
+            self.invalidate(k)
+            getattr(self, k)
+        return keys
+
+    def aresolve(self):
+        """
+        Resolve all values without blocking the event loop.
+
+        Returns an awaitable yielding the settings as a dictionary; see
+        `coolfig.aio.resolve` for the details.
+        """
+        from .aio import resolve
+
+        return resolve(self)
+
+    def _get_provider_index(self):
+        """
+        Return a dictionary mapping provider keys to the names of the
+        settings read from them, a list of (prefix, name) pairs for the
+        settings read from prefixed keys and the set of derived settings.
+
+        The index is cached on the class until the schema changes.
+        """
+        index = self._provider_index
+        if index is None:
+            keys, prefixes, derived = {}, [], set()
+            for k, v in self:
+                if isinstance(v, StaticValue):
+                    continue
+                key, prefix = v.provider_key(), v.provider_prefix()
+                if key is not None:
+                    keys.setdefault(key, []).append(k)
+                if prefix is not None:
+                    prefixes.append((prefix, k))
+                if v.derived:
+                    derived.add(k)
+            index = (keys, prefixes, frozenset(derived))
+            type.__setattr__(self.__class__, "_provider_index", index)
+        return index
+
+    def overlay(self, provider):
+        """
+        Return a new instance reading the values from `provider` first and
+        from the provider of this instance otherwise.
+
+        The new instance only resolves and caches the settings read from the
+        keys `provider` holds and the settings depending on them (according
+        to the dependencies recorded by this instance, see `dependents`);
+        all the others are read from this instance, sharing its cache.
+        Overlays of a large schema thus only use memory for the values they
+        change. The keys held by `provider` are listed once, when the overlay
+        is created. Invalidating values of this instance (or notifying it of
+        changes) invalidates the values cached by its overlays which depend
+        on them.
+        """
+        keys, prefixes, _ = self._get_provider_index()
+        overlaid = set()
+        for key, _ in provider.iterprefixed(""):
+            overlaid.update(keys.get(key, ()))
+            for prefix, name in prefixes:
+                if key.startswith(prefix):
+                    overlaid.add(name)
+        overlay = self.__class__(
+            FallbackProvider([provider, self.config_provider]),
+            stats=self._stats,
+        )
+        overlay._cache = OverlayCache(self, frozenset(overlaid))
+        if not self._overlays:
+            self._overlays = weakref.WeakSet()
+        self._overlays.add(overlay)
+        return overlay
+
+    def freeze(self):
+        """
+        Resolve all values and return them as an immutable snapshot.
+
+        The snapshot stores the values in slots, so reading them does not go
+        through the descriptors or the provider anymore. Any configuration
+        error is raised immediately instead of on first access.
+        """
+        values = self.as_dict()
+        frozen_class = type(
+            self.__class__.__name__,
+            (FrozenSettings,),
+            {"__slots__": tuple(sorted(values))},
+        )
+        frozen = frozen_class()
+        for k, v in values.items():
+            object.__setattr__(frozen, k, v)
+        return frozen
+
+
+class OverlayCache(dict):
+    """
+    Cache of the instances returned by `SettingsBase.overlay`, holding the
+    values of the `local` settings and reading all the others from the
+    `base` settings instance.
+
+    The `local` settings are the `overlaid` ones and the settings of `base`
+    depending on them. They are recomputed when new dependencies are
+    recorded by `base`, e.g. the first time it resolves a computed value.
+    """
+
+    __slots__ = ("base", "overlaid", "local", "version")
+
+    def __init__(self, base, overlaid):
+        self.base = base
+        self.overlaid = overlaid
+        self.refresh()
+
+    def refresh(self):
+        """
+        Recompute the `local` settings from the dependencies of `base`.
+        """
+        self.version = self.base._graph_version
+        local = set(self.overlaid)
+        for name in self.overlaid:
+            local.update(self.base.dependents(name))
+        self.local = local
+
+    def __missing__(self, key):
+        if key in self.local:
+            raise KeyError(key)
+        base = self.base
+        try:
+            value = getattr(base, key)
+        except Exception:
+            # The overlay may provide what the base instance is missing, let
+            # it resolve the value (and raise the error if still failing)
+            raise KeyError(key)
+        if self.version != base._graph_version:
+            self.refresh()
+            if key in self.local:
+                raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        # Settings which turn out to be local when read are resolved by the
+        # overlay all the same
+        return dict.__contains__(self, key) or key not in self.local
+
+
+class FrozenSettings(object):
+    """
+    Base class for the snapshots returned by `SettingsBase.freeze`.
+
+    Only ``__file__`` can be set, so that snapshots can be installed as a
+    module (see `coolfig.django.install_settings`).
+    """
+
+    __slots__ = ("__file__",)
+
+    def __setattr__(self, key, value):
+        if key == "__file__":
+            object.__setattr__(self, key, value)
+            return
+        raise AttributeError("can't set attribute")
+
+    def __delattr__(self, key):
+        raise AttributeError("can't delete attribute")
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def items(self):
+        for k in self.__slots__:
+            yield k, getattr(self, k)
+
+    def keys(self):
+        return iter(self.__slots__)
+
+    def as_dict(self):
+        return dict(self.items())
+
 
-class Settings(with_metaclass(SettingsMeta, SettingsBase)):
+class Settings(SettingsBase, metaclass=SettingsMeta):
     @classmethod
     def merge(cls, *others):
         """
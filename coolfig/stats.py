@@ -0,0 +1,103 @@
+"""
+Opt-in instrumentation of settings access and provider lookups.
+
+    stats = SettingsStats()
+    provider = providers.FallbackProvider([...], stats=stats)
+    settings = DefaultSettings(provider, stats=stats)
+    ...
+    stats.as_dict()
+"""
+from collections import Counter, defaultdict
+
+from .types import LazyCallable
+
+
+def type_name(type):
+    """
+    Return a dotted name identifying the coercion callable `type`.
+    """
+    if isinstance(type, LazyCallable):
+        return "{}.{}".format(type._module_path, type._callable_path)
+    name = getattr(type, "__qualname__", None) or getattr(
+        type, "__name__", None
+    )
+    if name is None:
+        return repr(type)
+    module = getattr(type, "__module__", None)
+    return "{}.{}".format(module, name) if module else name
+
+
+class SettingsStats(object):
+    """
+    Collects metrics about settings instances and providers using it.
+
+    * `accesses`: number of reads of each setting;
+    * `resolutions` and `resolution_time`: number of times each setting was
+      actually resolved (i.e. not served from the cache) and the cumulative
+      time spent doing so, in seconds;
+    * `coercions` and `coercion_time`: the same, per coercion type;
+    * `provider_hits` and `provider_misses`: lookups answered or not by
+      each layer of a `FallbackProvider`.
+
+    Callbacks registered with `subscribe` are called for each event with
+    the event name (``access``, ``resolve``, ``coerce``, ``hit`` or
+    ``miss``), the setting, type or layer name and the elapsed time (None
+    for events which are not timed).
+    """
+
+    def __init__(self):
+        self._callbacks = []
+        self.reset()
+
+    def reset(self):
+        self.accesses = Counter()
+        self.resolutions = Counter()
+        self.resolution_time = defaultdict(float)
+        self.coercions = Counter()
+        self.coercion_time = defaultdict(float)
+        self.provider_hits = Counter()
+        self.provider_misses = Counter()
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def _notify(self, event, name, elapsed=None):
+        for callback in self._callbacks:
+            callback(event, name, elapsed)
+
+    def record_access(self, key):
+        self.accesses[key] += 1
+        if self._callbacks:
+            self._notify("access", key)
+
+    def record_resolution(self, key, elapsed):
+        self.resolutions[key] += 1
+        self.resolution_time[key] += elapsed
+        if self._callbacks:
+            self._notify("resolve", key, elapsed)
+
+    def record_coercion(self, type, elapsed):
+        name = type_name(type)
+        self.coercions[name] += 1
+        self.coercion_time[name] += elapsed
+        if self._callbacks:
+            self._notify("coerce", name, elapsed)
+
+    def record_lookup(self, layer, hit):
+        if hit:
+            self.provider_hits[layer] += 1
+        else:
+            self.provider_misses[layer] += 1
+        if self._callbacks:
+            self._notify("hit" if hit else "miss", layer)
+
+    def as_dict(self):
+        return {
+            "accesses": dict(self.accesses),
+            "resolutions": dict(self.resolutions),
+            "resolution_time": dict(self.resolution_time),
+            "coercions": dict(self.coercions),
+            "coercion_time": dict(self.coercion_time),
+            "provider_hits": dict(self.provider_hits),
+            "provider_misses": dict(self.provider_misses),
+        }
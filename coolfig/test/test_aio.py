@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from coolfig import Settings, Value, computed_value
+from coolfig.aio import (
+    AsyncConfigurationProvider,
+    AsyncEnvDirConfig,
+    AsyncProviderAdapter,
+)
+from coolfig.providers import NOT_PROVIDED, DictConfig
+from coolfig.schema import DictValue, ImproperlyConfigured, ref
+
+
+class AsyncDictConfig(AsyncConfigurationProvider):
+    def __init__(self, conf_dict):
+        self._conf_dict = conf_dict
+
+    async def get(self, key):
+        await asyncio.sleep(0)
+        return self._conf_dict.get(key, NOT_PROVIDED)
+
+    async def iterprefixed(self, prefix):
+        for k, v in sorted(self._conf_dict.items()):
+            await asyncio.sleep(0)
+            if k.startswith(prefix):
+                yield k, v
+
+
+class AppSettings(Settings):
+    KEY = Value(int)
+    DEFKEY = Value(int, default=ref("KEY"))
+    DICTKEY = DictValue(int)
+
+    @computed_value
+    def COMPUTED(self):
+        return self.KEY + self.DEFKEY
+
+
+def test_async_config_abc():
+    conf = AsyncConfigurationProvider()
+
+    with pytest.raises(NotImplementedError):
+        asyncio.run(conf.get("key"))
+
+    with pytest.raises(NotImplementedError):
+        conf.iterprefixed("prefix")
+
+
+def test_adapter():
+    async def main():
+        conf = AsyncProviderAdapter(
+            DictConfig({"TEST": "value", "PREFIX_ONE": "foo"})
+        )
+        assert await conf.get("TEST") == "value"
+        assert await conf.get("FOO") is NOT_PROVIDED
+        assert await conf.get_many(["TEST", "FOO"]) == {
+            "TEST": "value",
+            "FOO": NOT_PROVIDED,
+        }
+        assert [i async for i in conf.iterprefixed("PREFIX_")] == [
+            ("PREFIX_ONE", "foo")
+        ]
+
+    asyncio.run(main())
+
+
+def test_envdirconfig(tmpdir):
+    tmpdir.join("TEST").write("value")
+    tmpdir.join("PREFIX_ONE").write("foo")
+
+    async def main():
+        conf = AsyncEnvDirConfig(str(tmpdir), snapshot=True)
+        assert await conf.get("TEST") == "value"
+        assert await conf.get("FOO") is NOT_PROVIDED
+        assert [i async for i in conf.iterprefixed("PREFIX_")] == [
+            ("PREFIX_ONE", "foo")
+        ]
+
+    asyncio.run(main())
+
+
+def test_aresolve():
+    conf = {"KEY": "1", "DICTKEY_A": "2", "DICTKEY_B": "3"}
+    settings = AppSettings(AsyncDictConfig(conf), cache=True)
+
+    values = asyncio.run(settings.aresolve())
+    assert values == {
+        "KEY": 1,
+        "DEFKEY": 1,
+        "DICTKEY": {"A": 2, "B": 3},
+        "COMPUTED": 2,
+    }
+
+    # Values are served from the cache, the provider is never used directly
+    assert settings.COMPUTED == 2
+    assert settings.DICTKEY == {"A": 2, "B": 3}
+
+
+def test_aresolve_overlay():
+    base = AppSettings(DictConfig({"KEY": "1", "DICTKEY_A": "2"}), cache=True)
+    tenant = base.overlay(DictConfig({"KEY": "10"}))
+
+    values = asyncio.run(tenant.aresolve())
+    assert values == {
+        "KEY": 10,
+        "DEFKEY": 10,
+        "DICTKEY": {"A": 2},
+        "COMPUTED": 20,
+    }
+    # Only the overlaid values and the values depending on them (according
+    # to the dependencies recorded by the base instance) are stored in the
+    # overlay cache
+    assert set(tenant._cache) == {"KEY"}
+    assert tenant.COMPUTED == 20
+    assert tenant.DICTKEY == {"A": 2}
+    assert set(tenant._cache) == {"KEY", "DEFKEY", "COMPUTED"}
+
+
+def test_aresolve_sync_provider():
+    settings = AppSettings(DictConfig({"KEY": "1", "DEFKEY": "3"}))
+    values = asyncio.run(settings.aresolve())
+    assert values == {"KEY": 1, "DEFKEY": 3, "DICTKEY": {}, "COMPUTED": 4}
+
+    settings = AppSettings(DictConfig({}))
+    with pytest.raises(ImproperlyConfigured):
+        asyncio.run(settings.aresolve())
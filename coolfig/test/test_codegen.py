@@ -0,0 +1,100 @@
+import runpy
+import sys
+import types as types_module
+
+from coolfig import Settings, Value, types
+from coolfig.codegen import fingerprint, is_stale, main, write_module
+from coolfig.django import make_django_settings
+from coolfig.providers import DictConfig
+from coolfig.schema import DictValue
+
+
+class CodegenSettings(Settings):
+    KEY = Value(int)
+    HOSTS = Value(types.list(str), default=())
+    PROVIDER = Value(types.dottedpath)
+    DICTKEY = DictValue(str)
+
+
+CONFIG = {
+    "KEY": "1",
+    "HOSTS": "a.example.com, b.example.com",
+    "PROVIDER": "coolfig.providers.DictConfig",
+    "DICTKEY_A": "a",
+}
+
+
+def test_write_module(tmpdir):
+    path = str(tmpdir.join("generated.py"))
+    conf = dict(CONFIG)
+    settings = CodegenSettings(DictConfig(conf))
+
+    assert is_stale(settings, path)
+    write_module(settings, path)
+    assert not is_stale(settings, path)
+
+    module = runpy.run_path(path)
+    assert module["KEY"] == 1
+    assert module["HOSTS"] == ["a.example.com", "b.example.com"]
+    assert module["PROVIDER"] is DictConfig
+    assert module["DICTKEY"] == {"A": "a"}
+    assert module["__coolfig_fingerprint__"] == fingerprint(settings)
+
+    conf["DICTKEY_B"] = "b"
+    assert is_stale(settings, path)
+    del conf["DICTKEY_B"]
+    assert not is_stale(settings, path)
+    conf["KEY"] = "2"
+    assert is_stale(settings, path)
+
+
+def test_fingerprint_static_values():
+    provider = DictConfig(CONFIG)
+    settings = make_django_settings({"DEBUG": False}, CodegenSettings)
+    digest = fingerprint(settings(provider))
+    assert fingerprint(settings(provider)) == digest
+    settings = make_django_settings({"DEBUG": True}, CodegenSettings)
+    assert fingerprint(settings(provider)) != digest
+
+
+def test_main(tmpdir, monkeypatch):
+    for k, v in CONFIG.items():
+        monkeypatch.setenv("CODEGEN_" + k, v)
+    monkeypatch.delenv("CODEGEN_KEY")
+    tmpdir.mkdir("secrets").join("KEY").write("3")
+
+    path = str(tmpdir.join("generated.py"))
+    args = [
+        "--settings",
+        "coolfig.test.test_codegen.CodegenSettings",
+        "--prefix",
+        "CODEGEN_",
+        "--envdir",
+        str(tmpdir.join("secrets")),
+        path,
+    ]
+    assert main(["--check"] + args) == 1
+    assert main(args) == 0
+    assert main(["--check"] + args) == 0
+    assert runpy.run_path(path)["KEY"] == 3
+
+    tmpdir.join("secrets", "KEY").write("4")
+    assert main(["--check"] + args) == 1
+
+
+def test_main_django(tmpdir, monkeypatch):
+    static = types_module.ModuleType("my_codegen_static")
+    static.INSTALLED_APPS = []
+    static.ROOT_URLCONF = "test.urls"
+    monkeypatch.setitem(sys.modules, "my_codegen_static", static)
+    monkeypatch.setenv("CODEGEN_SECRET_KEY", "secret")
+
+    path = str(tmpdir.join("generated.py"))
+    args = ["--django", "my_codegen_static", "--prefix", "CODEGEN_", path]
+    assert main(args) == 0
+    assert main(["--check"] + args) == 0
+
+    module = runpy.run_path(path)
+    assert module["SECRET_KEY"] == "secret"
+    assert module["ROOT_URLCONF"] == "test.urls"
+    assert module["DEBUG"] is False
@@ -1,11 +1,30 @@
+import base64
+import json
 import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import StreamRequestHandler, ThreadingMixIn, TCPServer
+from urllib.parse import unquote, urlsplit
+
+import pytest
 
 from coolfig.providers import (
     NOT_PROVIDED,
     DictConfig,
     EnvConfig,
     EnvDirConfig,
+    EnvFileConfig,
     FallbackProvider,
+    HTTPKVConfig,
+    INIConfig,
+    JSONConfig,
+    RedisConfig,
+    RedisError,
+    SharedMemoryConfig,
+    SharedMemoryPublisher,
+    TOMLConfig,
+    flatten,
 )
 
 
@@ -20,6 +39,123 @@ def test_dictconfig():
         "PREFIX_ONE": "foo",
         "PREFIX_TWO": "bar",
     }
+    assert conf.get_many(["TEST", "FOO"]) == {
+        "TEST": "value",
+        "FOO": NOT_PROVIDED,
+    }
+
+
+def test_dictconfig_indexed():
+    conf_dict = {
+        "APP_TEST": "value",
+        "APP_PREFIX_ONE": "foo",
+        "APP_PREFIX_TWO": "bar",
+        "APP_PREFIXED": "baz",
+        "OTHER_PREFIX_ONE": "other",
+    }
+    conf = DictConfig(conf_dict, prefix="APP_", indexed=True)
+    assert conf.get("TEST") == "value"
+    assert dict(conf.iterprefixed("NOPREFIX_")) == {}
+    assert dict(conf.iterprefixed("PREFIX_")) == {
+        "PREFIX_ONE": "foo",
+        "PREFIX_TWO": "bar",
+    }
+
+    # Adding keys rebuilds the index
+    conf_dict["APP_PREFIX_THREE"] = "qux"
+    assert dict(conf.iterprefixed("PREFIX_")) == {
+        "PREFIX_ONE": "foo",
+        "PREFIX_TWO": "bar",
+        "PREFIX_THREE": "qux",
+    }
+
+    # Replacing keys requires an explicit invalidation
+    del conf_dict["APP_PREFIX_ONE"]
+    conf_dict["APP_PREFIX_FOUR"] = "quux"
+    assert dict(conf.iterprefixed("PREFIX_")) == {
+        "PREFIX_TWO": "bar",
+        "PREFIX_THREE": "qux",
+    }
+    conf.invalidate()
+    assert dict(conf.iterprefixed("PREFIX_")) == {
+        "PREFIX_TWO": "bar",
+        "PREFIX_THREE": "qux",
+        "PREFIX_FOUR": "quux",
+    }
+
+
+def test_flatten():
+    data = {
+        "debug": True,
+        "hosts": ["a", "b"],
+        "db": {"default": {"url": "sqlite://", "port": 5432}},
+        "empty": None,
+    }
+    assert flatten(data) == {
+        "DEBUG": "true",
+        "HOSTS": "a,b",
+        "DB_DEFAULT_URL": "sqlite://",
+        "DB_DEFAULT_PORT": "5432",
+    }
+    assert flatten({"a": {"b": 1}}, prefix="APP.", sep=".") == {"APP.A.B": "1"}
+
+
+def test_jsonconfig(tmpdir):
+    path = tmpdir.join("settings.json")
+    path.write('{"app": {"test": "value", "databases": {"one": "foo"}}}')
+    conf = JSONConfig(str(path), prefix="APP_")
+    assert conf.get("TEST") == "value"
+    assert conf.get("FOO") is NOT_PROVIDED
+    assert dict(conf.iterprefixed("DATABASES_")) == {"DATABASES_ONE": "foo"}
+
+    # The parsed file is shared until it changes
+    other = JSONConfig(str(path))
+    assert other._conf_dict is conf._conf_dict
+    path.write('{"app": {"test": "new"}}')
+    stat = os.stat(str(path))
+    os.utime(str(path), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert conf.get("TEST") == "value"
+    conf.reload()
+    assert conf.get("TEST") == "new"
+    assert dict(conf.iterprefixed("DATABASES_")) == {}
+
+    conf = JSONConfig(str(tmpdir.join("missing.json")))
+    assert conf.get("TEST") is NOT_PROVIDED
+
+
+def test_tomlconfig(tmpdir):
+    pytest.importorskip("tomllib" if sys.version_info >= (3, 11) else "tomli")
+    path = tmpdir.join("settings.toml")
+    path.write(
+        "debug = false\n"
+        "hosts = ['a', 'b']\n"
+        "[databases]\n"
+        "default = 'sqlite://'\n"
+    )
+    conf = TOMLConfig(str(path))
+    assert conf.get("DEBUG") == "false"
+    assert conf.get("HOSTS") == "a,b"
+    assert dict(conf.iterprefixed("DATABASES_")) == {
+        "DATABASES_DEFAULT": "sqlite://"
+    }
+
+
+def test_iniconfig(tmpdir):
+    path = tmpdir.join("settings.ini")
+    path.write(
+        "[DEFAULT]\n"
+        "debug = true\n"
+        "[databases]\n"
+        "default = sqlite://\n"
+        "url = %(default)s\n"
+    )
+    conf = INIConfig(str(path))
+    assert conf.get("DEBUG") == "true"
+    assert dict(conf.iterprefixed("DATABASES_")) == {
+        "DATABASES_DEBUG": "true",
+        "DATABASES_DEFAULT": "sqlite://",
+        "DATABASES_URL": "%(default)s",
+    }
 
 
 def test_envconfig():
@@ -41,14 +177,438 @@ def test_envdirconfig(tmpdir):
         "PREFIX_ONE": "foo",
         "PREFIX_TWO": "bar",
     }
+    assert conf.get_many(["TEST", "FOO"]) == {
+        "TEST": "value",
+        "FOO": NOT_PROVIDED,
+    }
+
+    conf = EnvDirConfig(str(tmpdir), snapshot=True)
+    assert conf.get_many(["TEST", "FOO"]) == {
+        "TEST": "value",
+        "FOO": NOT_PROVIDED,
+    }
 
 
 def test_envdirconfig_nodir():
     conf = EnvDirConfig("/non-existing-coolfig-directory")
     assert conf.get("FOO") is NOT_PROVIDED
+    assert conf.get_many(["FOO"]) == {"FOO": NOT_PROVIDED}
     assert dict(conf.iterprefixed("PREFIX_")) == {}
 
 
+def test_envdirconfig_snapshot(tmpdir):
+    tmpdir.join("TEST").write("value")
+    tmpdir.join("PREFIX_ONE").write("foo")
+    tmpdir.mkdir("PREFIX_DIR")
+
+    conf = EnvDirConfig(str(tmpdir), snapshot=True)
+    assert conf.get("FOO") is NOT_PROVIDED
+    assert conf.get("TEST") == "value"
+    assert dict(conf.iterprefixed("PREFIX_")) == {"PREFIX_ONE": "foo"}
+
+    tmpdir.join("TEST").write("changed")
+    tmpdir.join("PREFIX_TWO").write("bar")
+    tmpdir.join("PREFIX_ONE").remove()
+    assert conf.get("TEST") == "value"
+    assert dict(conf.iterprefixed("PREFIX_")) == {"PREFIX_ONE": "foo"}
+
+    assert conf.reload() == {"TEST", "PREFIX_ONE", "PREFIX_TWO"}
+    assert conf.get("TEST") == "changed"
+    assert dict(conf.iterprefixed("PREFIX_")) == {"PREFIX_TWO": "bar"}
+    assert conf.reload() == set()
+
+
+def test_envdirconfig_invalidate(tmpdir):
+    tmpdir.join("TEST").write("value")
+    tmpdir.join("OTHER").write("other")
+
+    conf = EnvDirConfig(str(tmpdir), snapshot=True)
+    tmpdir.join("TEST").write("changed")
+    tmpdir.join("OTHER").remove()
+    tmpdir.join("NEW").write("new")
+    conf.invalidate("TEST")
+    conf.invalidate("OTHER")
+    assert conf.get("TEST") == "changed"
+    assert conf.get("OTHER") is NOT_PROVIDED
+    assert conf.get("NEW") is NOT_PROVIDED
+    conf.invalidate()
+    assert conf.get("NEW") == "new"
+
+    # Without a snapshot, there is nothing to invalidate
+    conf = EnvDirConfig(str(tmpdir))
+    conf.invalidate("TEST")
+    assert conf.get("TEST") == "changed"
+
+
+def test_envdirconfig_check_stale(tmpdir):
+    tmpdir.join("TEST").write("value")
+
+    conf = EnvDirConfig(str(tmpdir), snapshot=True, check_stale=True)
+    assert conf.get("OTHER") is NOT_PROVIDED
+
+    # Simulate the directory being touched by an atomic update
+    tmpdir.join("OTHER").write("other")
+    stat = os.stat(str(tmpdir))
+    os.utime(str(tmpdir), (stat.st_atime, stat.st_mtime + 10))
+    assert conf.get("OTHER") == "other"
+
+    conf = EnvDirConfig(
+        "/non-existing-coolfig-directory", snapshot=True, check_stale=True
+    )
+    assert conf.get("FOO") is NOT_PROVIDED
+    assert dict(conf.iterprefixed("PREFIX_")) == {}
+
+
+def test_envfileconfig(tmpdir):
+    envfile = tmpdir.join(".env")
+    envfile.write_binary(
+        b"# A comment\n"
+        b"\n"
+        b"APP_TEST=value\n"
+        b"export APP_PREFIX_ONE = 'foo # bar'\r\n"
+        b'APP_PREFIX_TWO="b\xc3\xa4r"\n'
+        b"APP_PREFIXED=baz # comment\n"
+        b"APP_EMPTY=\n"
+        b"OTHER_PREFIX_ONE=other=value"
+    )
+    conf = EnvFileConfig(str(envfile), prefix="APP_")
+    assert conf.get("FOO") is NOT_PROVIDED
+    assert conf.get("TEST") == "value"
+    assert conf.get("PREFIXED") == "baz"
+    assert conf.get("EMPTY") == ""
+    assert dict(conf.iterprefixed("NOPREFIX_")) == {}
+    assert dict(conf.iterprefixed("PREFIX_")) == {
+        "PREFIX_ONE": "foo # bar",
+        "PREFIX_TWO": "bär",
+    }
+    assert EnvFileConfig(str(envfile)).get("OTHER_PREFIX_ONE") == "other=value"
+
+    tmpdir.join(".env.new").write("APP_TEST=new\n")
+    os.replace(str(tmpdir.join(".env.new")), str(envfile))
+    assert conf.get("TEST") == "value"
+    conf.reload()
+    assert conf.get("TEST") == "new"
+    assert conf.get("PREFIXED") is NOT_PROVIDED
+
+    conf = EnvFileConfig(str(tmpdir.join("missing.env")))
+    assert conf.get("TEST") is NOT_PROVIDED
+    assert dict(conf.iterprefixed("")) == {}
+
+
+def test_sharedmemoryconfig(tmpdir):
+    path = str(tmpdir.join("settings.shm"))
+    conf = SharedMemoryConfig(path, prefix="APP_")
+    assert conf.generation == 0
+    assert conf.get("TEST") is NOT_PROVIDED
+    assert dict(conf.iterprefixed("PREFIX_")) == {}
+
+    publisher = SharedMemoryPublisher(path)
+    assert publisher.publish({"APP_TEST": "välue", "APP_PREFIX_ONE": "foo"})
+    assert conf.generation == 1
+    assert conf.get("TEST") == "välue"
+    assert conf.get("PREFIX") is NOT_PROVIDED
+    assert conf.get("ZZZ") is NOT_PROVIDED
+    assert dict(conf.iterprefixed("PREFIX_")) == {"PREFIX_ONE": "foo"}
+
+    # Readers switch to the new snapshot once published
+    generation = publisher.publish(
+        {
+            "APP_TEST": "new",
+            "APP_PREFIX_ONE": "foo",
+            "APP_PREFIX_TWO": "bar",
+            "APP_PREFIXED": "baz",
+            "OTHER_PREFIX_ONE": "other",
+        }
+    )
+    assert generation == 2
+    assert conf.get("TEST") == "new"
+    assert conf.generation == 2
+    assert dict(conf.iterprefixed("PREFIX_")) == {
+        "PREFIX_ONE": "foo",
+        "PREFIX_TWO": "bar",
+    }
+    assert conf.get_many(["TEST", "FOO"]) == {
+        "TEST": "new",
+        "FOO": NOT_PROVIDED,
+    }
+    assert SharedMemoryConfig(path).get("OTHER_PREFIX_ONE") == "other"
+
+
+@pytest.mark.parametrize("content", [b"", b"CFG"])
+def test_sharedmemoryconfig_truncated(tmpdir, content):
+    path = tmpdir.join("settings.shm")
+    path.write(content, mode="wb")
+    conf = SharedMemoryConfig(str(path))
+    assert conf.generation == 0
+    assert conf.get("TEST") is NOT_PROVIDED
+    assert dict(conf.iterprefixed("")) == {}
+
+    SharedMemoryPublisher(str(path)).publish({"TEST": "value"})
+    assert conf.get("TEST") == "value"
+
+
+class KVRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        server.clients.add(self.client_address)
+        url = urlsplit(self.path)
+        key = unquote(url.path[len("/v1/kv/") :])
+        if url.query == "recurse":
+            entries = [
+                {"Key": k, "Value": base64.b64encode(v.encode()).decode()}
+                for k, v in sorted(server.kv.items())
+                if k.startswith(key)
+            ]
+            body = json.dumps(entries).encode() if entries else None
+        else:
+            body = server.kv[key].encode() if key in server.kv else None
+        self.send_response(404 if body is None else 200)
+        self.send_header("Content-Length", str(len(body or b"")))
+        self.end_headers()
+        self.wfile.write(body or b"")
+
+    def log_message(self, *args):
+        pass
+
+
+class KVServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def kv_server():
+    server = KVServer(("127.0.0.1", 0), KVRequestHandler)
+    server.kv, server.requests, server.clients = {}, [], set()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,))
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_httpkvconfig(kv_server):
+    kv_server.kv.update(
+        {
+            "config/app/TEST": "välue",
+            "config/app/PREFIX_ONE": "foo",
+            "config/app/PREFIX_TWO": "bar",
+            "config/other/TEST": "other",
+            "app/TEST": "other",
+        }
+    )
+    url = "http://127.0.0.1:{}/v1/kv/config".format(kv_server.server_port)
+    conf = HTTPKVConfig(url, prefix="app/")
+    assert conf.get("TEST") == "välue"
+    assert conf.get("FOO") is NOT_PROVIDED
+    assert dict(conf.iterprefixed("NOPREFIX_")) == {}
+    assert dict(conf.iterprefixed("PREFIX_")) == {
+        "PREFIX_ONE": "foo",
+        "PREFIX_TWO": "bar",
+    }
+    assert kv_server.requests == [
+        "/v1/kv/config/app/TEST?raw",
+        "/v1/kv/config/app/FOO?raw",
+        "/v1/kv/config/app/NOPREFIX_?recurse",
+        "/v1/kv/config/app/PREFIX_?recurse",
+    ]
+    # All the requests went through the same connection
+    assert len(kv_server.clients) == 1
+
+    # Responses are cached
+    kv_server.kv["config/app/TEST"] = "new"
+    assert conf.get("TEST") == "välue"
+    assert conf.get("FOO") is NOT_PROVIDED
+    assert len(kv_server.requests) == 4
+
+    # Batch lookups fetch the whole prefix at once
+    assert conf.get_many(["TEST", "PREFIX_ONE", "BAR"]) == {
+        "TEST": "välue",
+        "PREFIX_ONE": "foo",
+        "BAR": NOT_PROVIDED,
+    }
+    assert kv_server.requests[4:] == ["/v1/kv/config/app/?recurse"]
+    assert conf.get("PREFIX_ONE") == "foo"
+    assert len(kv_server.requests) == 5
+
+    kv_server.kv["config/app/PREFIX_ONE"] = "new"
+    conf.invalidate("TEST")
+    assert conf.get("TEST") == "new"
+    assert dict(conf.iterprefixed("PREFIX_"))["PREFIX_ONE"] == "foo"
+    conf.invalidate("PREFIX_ONE")
+    assert dict(conf.iterprefixed("PREFIX_"))["PREFIX_ONE"] == "new"
+
+    kv_server.kv["config/app/TEST"] = "newer"
+    conf.invalidate()
+    assert conf.get("TEST") == "newer"
+    conf.close()
+
+
+def test_httpkvconfig_ttl(kv_server):
+    kv_server.kv["TEST"] = "value"
+    url = "http://127.0.0.1:{}/v1/kv/".format(kv_server.server_port)
+    conf = HTTPKVConfig(url, ttl=0)
+    assert conf.get("TEST") == "value"
+    kv_server.kv["TEST"] = "new"
+    assert conf.get("TEST") == "new"
+    assert conf.get_many(["TEST", "FOO"]) == {
+        "TEST": "new",
+        "FOO": NOT_PROVIDED,
+    }
+
+    # Connections closed by the server are replaced
+    conf._pool[0].sock.close()
+    assert conf.get("TEST") == "new"
+    assert len(kv_server.clients) == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_httpkvconfig_fork(kv_server):
+    kv_server.kv["TEST"] = "value"
+    url = "http://127.0.0.1:{}/v1/kv".format(kv_server.server_port)
+    conf = HTTPKVConfig(url, ttl=0)
+    assert conf.get("TEST") == "value"
+    inherited = conf._pool[0]
+
+    pid = os.fork()
+    if not pid:  # NOCOV
+        ok = conf.get("TEST") == "value" and inherited.sock is None
+        os._exit(0 if ok else 1)
+    assert os.waitpid(pid, 0)[1] == 0
+    # The child process didn't reuse the connection of the parent
+    assert len(kv_server.clients) == 2
+    assert conf.get("TEST") == "value"
+    assert len(kv_server.clients) == 2
+
+
+class RedisRequestHandler(StreamRequestHandler):
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def write_bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        server = self.server
+        server.clients.add(self.client_address)
+        while True:
+            args = self.read_command()
+            if args is None:
+                break
+            command = args[0].decode().upper()
+            server.commands.append(command)
+            if command == "GET":
+                reply = self.write_bulk(server.data.get(args[1]))
+            elif command == "MGET":
+                reply = b"*%d\r\n" % (len(args) - 1) + b"".join(
+                    self.write_bulk(server.data.get(k)) for k in args[1:]
+                )
+            elif command == "SCAN":
+                # Return one key per call, only "<prefix>*" patterns
+                cursor, pattern = int(args[1]), args[3]
+                prefix = pattern[:-1].replace(b"\\", b"")
+                keys = sorted(k for k in server.data if k.startswith(prefix))
+                found = keys[cursor : cursor + 1]
+                cursor = cursor + 1 if cursor + 1 < len(keys) else 0
+                reply = b"*2\r\n" + self.write_bulk(b"%d" % cursor)
+                reply += b"*%d\r\n" % len(found)
+                reply += b"".join(self.write_bulk(k) for k in found)
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+class RedisServer(ThreadingMixIn, TCPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def redis_server():
+    server = RedisServer(("127.0.0.1", 0), RedisRequestHandler)
+    server.data, server.commands, server.clients = {}, [], set()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,))
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def test_redisconfig(redis_server):
+    redis_server.data.update(
+        {
+            b"app:TEST": "välue".encode(),
+            b"app:PREFIX_ONE": b"foo",
+            b"app:PREFIX_TWO": b"bar",
+            b"app:PREFIX*": b"glob",
+            b"other:TEST": b"other",
+        }
+    )
+    url = "redis://127.0.0.1:{}".format(redis_server.server_address[1])
+    conf = RedisConfig(url, prefix="app:", batch_size=2)
+    assert conf.get("TEST") == "välue"
+    assert conf.get("FOO") is NOT_PROVIDED
+    assert conf.get_many(["TEST", "FOO", "PREFIX_ONE"]) == {
+        "TEST": "välue",
+        "FOO": NOT_PROVIDED,
+        "PREFIX_ONE": "foo",
+    }
+    assert conf.get_many([]) == {}
+    assert redis_server.commands == ["GET", "GET", "MGET", "MGET"]
+
+    assert dict(conf.iterprefixed("NOPREFIX_")) == {}
+    assert dict(conf.iterprefixed("PREFIX_")) == {
+        "PREFIX_ONE": "foo",
+        "PREFIX_TWO": "bar",
+    }
+    assert dict(conf.iterprefixed("PREFIX*")) == {"PREFIX*": "glob"}
+
+    # The connections are shared by all the providers for the same server
+    other = RedisConfig(url)
+    assert other.get("other:TEST") == "other"
+    assert len(redis_server.clients) == 1
+
+    with pytest.raises(RedisError):
+        other._pool.execute_many([("FLUSHALL",)])
+    assert other.get("other:TEST") == "other"
+    assert len(redis_server.clients) == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_redisconfig_fork(redis_server):
+    redis_server.data[b"TEST"] = b"value"
+    url = "redis://127.0.0.1:{}".format(redis_server.server_address[1])
+    conf = RedisConfig(url)
+    assert conf.get("TEST") == "value"
+    inherited = conf._pool._idle[0]
+
+    pid = os.fork()
+    if not pid:  # NOCOV
+        ok = conf.get("TEST") == "value" and inherited._sock.fileno() == -1
+        os._exit(0 if ok else 1)
+    assert os.waitpid(pid, 0)[1] == 0
+    # The child process didn't reuse the connection of the parent
+    assert len(redis_server.clients) == 2
+    assert conf.get("TEST") == "value"
+    assert len(redis_server.clients) == 2
+
+
 def test_fallbackprovider():
     conf = FallbackProvider(
         [
@@ -75,3 +635,80 @@ def test_fallbackprovider():
         "PREFIX_TWO": "bar",
         "PREFIX_THREE": "rightbar",
     }
+    assert conf.get_many(["FOO", "TEST1", "TEST2"]) == {
+        "FOO": NOT_PROVIDED,
+        "TEST1": "value",
+        "TEST2": "rightvalue",
+    }
+
+
+class CountingConfig(DictConfig):
+    def __init__(self, *args, **kwargs):
+        super(CountingConfig, self).__init__(*args, **kwargs)
+        self.lookups = []
+
+    def get(self, key):
+        self.lookups.append(key)
+        return super(CountingConfig, self).get(key)
+
+
+def test_fallbackprovider_cache():
+    first = CountingConfig({"TEST1": "value"})
+    second = CountingConfig({"TEST1": "wrongvalue", "TEST2": "rightvalue"})
+    conf = FallbackProvider([first, second], cache=True)
+
+    for i in range(3):
+        assert conf.get("TEST1") == "value"
+        assert conf.get("TEST2") == "rightvalue"
+        assert conf.get("FOO") is NOT_PROVIDED
+    assert first.lookups == ["TEST1", "TEST2", "FOO", "TEST1", "TEST1"]
+    assert second.lookups == ["TEST2", "FOO", "TEST2", "TEST2"]
+
+    # Values are still read from the provider which answered
+    second._conf_dict["TEST2"] = "newvalue"
+    assert conf.get("TEST2") == "newvalue"
+
+    # Missing keys are remembered until invalidated
+    second._conf_dict["FOO"] = "foo"
+    assert conf.get("FOO") is NOT_PROVIDED
+    conf.invalidate("FOO")
+    assert conf.get("FOO") == "foo"
+
+    # Removed keys trigger a new lookup in all providers
+    del first._conf_dict["TEST1"]
+    assert conf.get("TEST1") == "wrongvalue"
+
+    first._conf_dict["TEST2"] = "override"
+    assert conf.get("TEST2") == "newvalue"
+    conf.invalidate()
+    assert conf.get("TEST2") == "override"
+
+
+class BatchCountingConfig(DictConfig):
+    def __init__(self, *args, **kwargs):
+        super(BatchCountingConfig, self).__init__(*args, **kwargs)
+        self.batches = []
+
+    def get_many(self, keys):
+        self.batches.append(sorted(keys))
+        return super(BatchCountingConfig, self).get_many(keys)
+
+
+def test_fallbackprovider_get_many_cache():
+    first = BatchCountingConfig({"TEST1": "value"})
+    second = BatchCountingConfig({"TEST1": "wrong", "TEST2": "right"})
+    conf = FallbackProvider([first, second], cache=True)
+
+    expected = {"FOO": NOT_PROVIDED, "TEST1": "value", "TEST2": "right"}
+    assert conf.get_many(["FOO", "TEST1", "TEST2"]) == expected
+    assert first.batches == [["FOO", "TEST1", "TEST2"]]
+    assert second.batches == [["FOO", "TEST2"]]
+
+    assert conf.get_many(["FOO", "TEST1", "TEST2"]) == expected
+    assert first.batches[1:] == [["TEST1"]]
+    assert second.batches[1:] == [["TEST2"]]
+
+    del second._conf_dict["TEST2"]
+    first._conf_dict["TEST2"] = "new"
+    assert conf.get_many(["TEST2"]) == {"TEST2": "new"}
+    assert conf.get("TEST2") == "new"
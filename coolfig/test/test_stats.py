@@ -0,0 +1,58 @@
+from coolfig import Settings, Value, types
+from coolfig.providers import DictConfig, FallbackProvider
+from coolfig.schema import DictValue
+from coolfig.stats import SettingsStats, type_name
+
+
+class AppSettings(Settings):
+    KEY = Value(int)
+    DEFKEY = Value(types.boolean, default=False)
+    DICTKEY = DictValue(int)
+
+
+def test_type_name():
+    assert type_name(int) == "builtins.int"
+    assert type_name(types.boolean) == "coolfig.types.boolean"
+    assert type_name(types.sqlalchemy_url) == "sqlalchemy.engine.url.make_url"
+    # Lazily imported types still belong to coolfig.types
+    assert types.sqlalchemy_url.__module__ == "coolfig.types"
+
+
+def test_settings_stats():
+    stats = SettingsStats()
+    events = []
+    stats.subscribe(lambda *args: events.append(args))
+
+    provider = FallbackProvider(
+        [DictConfig({"KEY": "1"}), DictConfig({"DICTKEY_A": "2"})],
+        stats=stats,
+    )
+    s = AppSettings(provider, cache=True, stats=stats)
+
+    for i in range(3):
+        assert s.KEY == 1
+    assert s.DEFKEY is False
+    assert s.DICTKEY == {"A": 2}
+
+    assert stats.accesses == {"KEY": 3, "DEFKEY": 1, "DICTKEY": 1}
+    assert stats.resolutions == {"KEY": 1, "DEFKEY": 1, "DICTKEY": 1}
+    assert set(stats.resolution_time) == {"KEY", "DEFKEY", "DICTKEY"}
+    assert stats.coercions == {"builtins.int": 2}
+    assert stats.provider_hits == {"0:DictConfig": 1}
+    assert stats.provider_misses == {"0:DictConfig": 1, "1:DictConfig": 1}
+
+    assert events[:4] == [
+        ("access", "KEY", None),
+        ("hit", "0:DictConfig", None),
+        ("coerce", "builtins.int", events[2][2]),
+        ("resolve", "KEY", events[3][2]),
+    ]
+
+    stats.reset()
+    s.invalidate()
+    assert s.as_dict() == {"KEY": 1, "DEFKEY": False, "DICTKEY": {"A": 2}}
+    assert stats.as_dict()["accesses"] == {"KEY": 1, "DEFKEY": 1, "DICTKEY": 1}
+    assert stats.as_dict()["provider_misses"] == {
+        "0:DictConfig": 1,
+        "1:DictConfig": 1,
+    }
@@ -0,0 +1,175 @@
+import threading
+
+import pytest
+
+from coolfig import Settings, Value, computed_value
+from coolfig.providers import DictConfig, EnvDirConfig, FallbackProvider
+from coolfig.schema import DictValue, ref
+from coolfig.watch import EnvDirWatcher, Inotify
+
+
+class AppSettings(Settings):
+    KEY = Value(str)
+    OTHER = Value(str, default="other")
+    DEFKEY = Value(str, default=ref("KEY"))
+    DICTKEY = DictValue(str)
+
+    @computed_value
+    def COMPUTED(self):
+        return self.KEY.upper()
+
+
+def test_notify_changed():
+    provider = EnvDirConfig("/non-existing-coolfig-directory", snapshot=True)
+    s = AppSettings(provider, cache=True)
+    s._cache.update({"KEY": "a", "OTHER": "b", "DICTKEY": {}})
+    assert s.DEFKEY == "a"
+    assert s.COMPUTED == "A"
+
+    notifications = []
+    s.add_change_callback(lambda *args: notifications.append(args))
+
+    assert s.notify_changed(["OTHER"]) == {"OTHER"}
+    assert notifications == [(s, {"OTHER"})]
+
+    assert s.notify_changed(["KEY"]) == {"KEY", "DEFKEY", "COMPUTED"}
+    assert s._cache == {"DICTKEY": {}}
+
+    assert "DICTKEY" in s.notify_changed(["DICTKEY_A"])
+    assert s._cache == {}
+
+
+def test_notify_changed_provider_cache():
+    conf = {}
+    provider = FallbackProvider([DictConfig(conf)], cache=True)
+    s = AppSettings(provider, cache=True)
+    assert s.OTHER == "other"
+
+    # The provider remembers OTHER as missing until notified
+    conf["OTHER"] = "changed"
+    assert s.notify_changed(["OTHER"]) == {"OTHER"}
+    assert s.OTHER == "changed"
+
+
+def test_check(tmpdir):
+    tmpdir.join("KEY").write("value")
+    provider = EnvDirConfig(str(tmpdir))
+    s = AppSettings(provider, cache=True)
+    watcher = EnvDirWatcher(provider)
+    watcher.subscribe(s.notify_changed)
+
+    assert s.KEY == "value"
+    assert s.COMPUTED == "VALUE"
+    assert watcher.check() == set()
+
+    tmpdir.join("KEY").write("changed!")
+    tmpdir.join("DICTKEY_A").write("a")
+    assert s.KEY == "value"
+    assert watcher.check() == {"KEY", "DICTKEY_A"}
+    assert s.KEY == "changed!"
+    assert s.COMPUTED == "CHANGED!"
+    assert s.DICTKEY == {"A": "a"}
+
+    tmpdir.join("DICTKEY_A").remove()
+    assert watcher.check() == {"DICTKEY_A"}
+    assert s.DICTKEY == {}
+
+
+@pytest.mark.parametrize(
+    "use_inotify",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not Inotify.available(), reason="inotify is not available"
+            ),
+        ),
+    ],
+)
+def test_watcher_thread(tmpdir, use_inotify):
+    tmpdir.join("KEY").write("value")
+    provider = EnvDirConfig(str(tmpdir), snapshot=True)
+    watcher = EnvDirWatcher(provider, interval=0.01, use_inotify=use_inotify)
+
+    event = threading.Event()
+    changes = []
+
+    def callback(keys):
+        changes.append(keys)
+        event.set()
+
+    watcher.subscribe(callback)
+    watcher.start()
+    try:
+        tmpdir.join("OTHER").write("other")
+        assert event.wait(5)
+    finally:
+        watcher.stop()
+
+    assert changes[0] == {"OTHER"}
+    assert provider.get("OTHER") == "other"
+
+
+@pytest.mark.skipif(not Inotify.available(), reason="inotify is not available")
+def test_watcher_thread_replaced_directory(tmpdir):
+    path = tmpdir.join("secrets")
+    path.mkdir().join("KEY").write("value")
+    provider = EnvDirConfig(str(path), snapshot=True)
+    watcher = EnvDirWatcher(provider, interval=0.01, use_inotify=True)
+
+    changes = []
+    condition = threading.Condition()
+
+    def callback(keys):
+        with condition:
+            changes.append(keys)
+            condition.notify_all()
+
+    def wait_for(key, value):
+        with condition:
+            return condition.wait_for(lambda: provider.get(key) == value, 5)
+
+    watcher.subscribe(callback)
+    watcher.start()
+    try:
+        # Replace the directory, which drops the inotify watch
+        path.rename(tmpdir.join("old"))
+        replacement = tmpdir.mkdir("new")
+        replacement.join("KEY").write("changed")
+        replacement.rename(path)
+        # The directory may be seen missing for a moment
+        assert wait_for("KEY", "changed")
+
+        # Changes to the new directory are still picked up
+        path.join("OTHER").write("other")
+        assert wait_for("OTHER", "other")
+    finally:
+        watcher.stop()
+    assert {"KEY"} in changes
+
+
+def test_watcher_thread_error(tmpdir, caplog):
+    provider = EnvDirConfig(str(tmpdir), snapshot=True)
+    watcher = EnvDirWatcher(provider, interval=0.01, use_inotify=False)
+
+    failed, recovered = threading.Event(), threading.Event()
+
+    def callback(keys):
+        if not failed.is_set():
+            failed.set()
+            raise ValueError("callback failed")
+        if "OTHER" in keys:
+            recovered.set()
+
+    watcher.subscribe(callback)
+    watcher.start()
+    try:
+        tmpdir.join("KEY").write("value")
+        assert failed.wait(5)
+        tmpdir.join("OTHER").write("other")
+        assert recovered.wait(5)
+    finally:
+        watcher.stop()
+
+    assert "callback failed" in caplog.text
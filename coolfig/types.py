@@ -1,6 +1,7 @@
 """
 Common types for settings classes.
 """
+import functools
 import importlib
 
 
@@ -36,8 +37,35 @@ class LazyCallable(object):
         return self.func(*args, **kwargs)
 
 
+def memoize(func, maxsize=256):
+    """
+    Wrap the coercion callable `func` with a bounded LRU cache of its results
+    keyed on the raw value, so that repeatedly coercing the same string does
+    not repeat the work. Unhashable values are coerced without caching.
+
+    The cached results are shared between calls, `func` should thus return
+    immutable values (or the caller should copy them).
+    """
+    cached = functools.lru_cache(maxsize)(func)
+
+    @functools.wraps(func)
+    def convert(value):
+        try:
+            hash(value)
+        except TypeError:
+            return func(value)
+        return cached(value)
+
+    convert.cache_clear = cached.cache_clear
+    convert.cache_info = cached.cache_info
+    return convert
+
+
+_TRUE_VALUES = frozenset(["1", "true", "yes", "on", "y"])
+
+
 def boolean(string):
-    return string.lower() in set(["1", "true", "yes", "on", "y"])
+    return string.lower() in _TRUE_VALUES
 
 
 sqlalchemy_url = LazyCallable("sqlalchemy.engine.url", "make_url")
@@ -46,10 +74,24 @@ django_db_url = LazyCallable("environ", "Env.db_url_config")
 django_cache_url = LazyCallable("environ", "Env.cache_url_config")
 
 
-def list(inner_type, sep=","):
-    def convert(string):
+def list(inner_type, sep=",", maxsize=128):
+    """
+    Return a converter splitting strings on `sep` and coercing each item
+    with `inner_type`.
+
+    The parsed lists of the last `maxsize` distinct strings are memoized
+    (pass 0 to disable); each call returns a fresh copy.
+    """
+
+    def parse(string):
         return [inner_type(s.strip()) for s in string.split(sep)]
 
+    if maxsize != 0:
+        parse = memoize(parse, maxsize)
+
+    def convert(string):
+        return parse(string)[:]
+
     return convert
 
 
@@ -0,0 +1,227 @@
+"""
+Reloading of `EnvDirConfig` directories when their contents change.
+
+    provider = providers.EnvDirConfig('/run/secrets', snapshot=True)
+    settings = DefaultSettings(provider, cache=True)
+    watcher = watch.EnvDirWatcher(provider)
+    watcher.subscribe(settings.notify_changed)
+    watcher.start()
+"""
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+
+
+logger = logging.getLogger(__name__)
+
+
+class Inotify(object):
+    """
+    Minimal ctypes binding to the Linux inotify API, watching a single
+    directory for entries being created, removed, modified or replaced.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_IGNORED = 0x00008000
+
+    MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_CREATE | IN_DELETE
+    MASK |= IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF
+
+    # Events signaling that the watched directory itself is gone
+    GONE = IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED
+
+    # struct inotify_event, followed by the name of the entry
+    _event = struct.Struct("iIII")
+
+    _libc = None
+
+    @classmethod
+    def get_libc(cls):
+        if cls._libc is None:
+            if not sys.platform.startswith("linux"):
+                return None
+            path = ctypes.util.find_library("c")
+            try:
+                libc = ctypes.CDLL(path, use_errno=True)
+                libc.inotify_init1
+                libc.inotify_add_watch
+            except (OSError, AttributeError):
+                return None
+            cls._libc = libc
+        return cls._libc
+
+    @classmethod
+    def available(cls):
+        return cls.get_libc() is not None
+
+    def __init__(self, path):
+        libc = self.get_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(path), self.MASK)
+        if wd < 0:
+            e = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(e, os.strerror(e), path)
+
+    def wait(self, timeout):
+        """
+        Wait up to `timeout` seconds for events and discard them. Returns
+        the union of the masks of the received events (0 if none).
+        """
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return 0
+        mask = 0
+        try:
+            while True:
+                data = os.read(self.fd, 4096)
+                if not data:
+                    break
+                # The kernel only returns whole events
+                offset = 0
+                while offset < len(data):
+                    _, event_mask, _, length = self._event.unpack_from(
+                        data, offset
+                    )
+                    mask |= event_mask
+                    offset += self._event.size + length
+        except BlockingIOError:
+            pass
+        return mask
+
+    def close(self):
+        os.close(self.fd)
+
+
+class EnvDirWatcher(object):
+    """
+    Watches the directory of an `EnvDirConfig` provider and reloads its
+    snapshot when files are added, removed or changed.
+
+    Subscribed callbacks are called with the set of changed keys after each
+    reload. Changes are detected with inotify where available and by
+    polling the directory every `interval` seconds otherwise. Errors raised
+    while reloading in the background thread are logged.
+    """
+
+    def __init__(self, provider, interval=1.0, use_inotify=None):
+        self._provider = provider
+        self._interval = interval
+        if use_inotify is None:
+            use_inotify = Inotify.available()
+        self._use_inotify = use_inotify
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._signature = self._get_signature()
+        if provider._snapshot is None:
+            provider.reload()
+
+    def subscribe(self, callback):
+        self._callbacks.append(callback)
+
+    def _get_signature(self):
+        try:
+            entries = list(os.scandir(self._provider._base_path))
+        except OSError:
+            return None
+        signature = {}
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            signature[entry.name] = (stat.st_ino, stat.st_mtime, stat.st_size)
+        return signature
+
+    def check(self, force=False):
+        """
+        Reload the snapshot if the directory changed (or unconditionally if
+        `force` is true) and notify the subscribers.
+
+        Returns the set of changed keys.
+        """
+        with self._lock:
+            signature = self._get_signature()
+            if not force and signature == self._signature:
+                return set()
+            self._signature = signature
+            changed = self._provider.reload()
+        if changed:
+            for callback in self._callbacks:
+                callback(changed)
+        return changed
+
+    def _watch(self):
+        if self._use_inotify:
+            try:
+                return Inotify(self._provider._base_path)
+            except OSError:
+                pass  # Fall back to polling (e.g. missing directory)
+        return None
+
+    def start(self):
+        inotify = self._watch()
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(inotify,), name="coolfig-envdir-watcher"
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _check(self, force=False):
+        # Errors (e.g. in a callback) are logged rather than stopping the
+        # thread, so that later changes are still picked up
+        try:
+            self.check(force)
+        except Exception:
+            logger.exception("Error reloading %s", self._provider._base_path)
+
+    def _run(self, inotify):
+        try:
+            while not self._stopped.is_set():
+                if inotify is None:
+                    if not self._stopped.wait(self._interval):
+                        self._check()
+                        # Watch the directory again once it exists
+                        inotify = self._watch()
+                    continue
+                mask = inotify.wait(self._interval)
+                if mask:
+                    self._check(force=True)
+                if mask & Inotify.GONE:
+                    # The directory was removed or replaced, and the kernel
+                    # dropped the watch: watch the current directory, if any,
+                    # or poll until it exists
+                    inotify.close()
+                    inotify = self._watch()
+                    self._check()
+        finally:
+            if inotify is not None:
+                inotify.close()
@@ -116,6 +116,7 @@ setup(
     package_dir={PACKAGE: PACKAGE},
     description="Helpers for dealing with application settings",
     install_requires=Setup.requirements("requirements.txt"),
+    python_requires=">=3.7",
     long_description=Setup.longdesc(),
     entry_points=Setup.read("entry-points.ini", True),
     classifiers=[
@@ -124,9 +125,7 @@ setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
         "Programming Language :: Python",
-        "Programming Language :: Python :: 2.7",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.3",
-        "Programming Language :: Python :: 3.4",
+        "Programming Language :: Python :: 3 :: Only",
     ],
 )